@@ -0,0 +1,165 @@
+# pylint: skip-file
+"""Benchmarks for the Glimmr integration.
+
+Usage:
+  python benchmark.py transport <host> [iterations]
+      Compare HTTP and UDP ambient color latency against a device.
+  python benchmark.py record <host> <seconds> <file>
+      Record olo, frames and stats pushes from a device as JSON lines.
+  python benchmark.py decode <file> [iterations]
+      Compare JSON and MessagePack decode cost per recorded message.
+"""
+import asyncio
+import base64
+import json
+import statistics
+import sys
+import time
+
+import aiohttp
+import glimmr
+
+from custom_components.glimmr.frames import _frame_bytes
+from custom_components.glimmr.signalr import (
+    MESSAGE_INVOCATION,
+    RECORD_SEPARATOR,
+    GlimmrSocket,
+    _decode,
+    _decode_msgpack,
+    _frame_msgpack,
+)
+from custom_components.glimmr.udp import GlimmrUdpTransport, color_packets
+
+RECORDED_TARGETS = ("olo", "frames", "stats")
+
+COLORS = ("#ff0000", "#00ff00", "#0000ff")
+
+
+def report(name, samples, failures=0):
+    if not samples:
+        print(f"{name}: no successful sends, {failures} failed")
+        return
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{name}: n={len(samples)} failed={failures} "
+        f"min={samples[0] * 1000:.1f}ms "
+        f"median={statistics.median(samples) * 1000:.1f}ms "
+        f"p95={p95 * 1000:.1f}ms"
+    )
+
+
+async def bench_http(host, iterations):
+    device = glimmr.Glimmr(host)
+    samples = []
+    try:
+        for i in range(iterations):
+            started = time.perf_counter()
+            await device.set_ambient_color(COLORS[i % len(COLORS)])
+            samples.append(time.perf_counter() - started)
+    finally:
+        if device.session:
+            await device.session.close()
+    report("http", samples)
+
+
+async def bench_udp(host, iterations):
+    transport = GlimmrUdpTransport(host)
+    samples = []
+    failures = 0
+    try:
+        for i in range(iterations):
+            started = time.perf_counter()
+            if await transport.async_send(color_packets(COLORS[i % len(COLORS)])):
+                samples.append(time.perf_counter() - started)
+            else:
+                failures += 1
+    finally:
+        transport.close()
+    report("udp", samples, failures)
+
+
+async def bench_transport(host, iterations=50):
+    await bench_http(host, iterations)
+    await bench_udp(host, iterations)
+
+
+async def record(host, seconds, path):
+    async with aiohttp.ClientSession() as session:
+        socket = GlimmrSocket(host, session)
+        with open(path, "w") as out:
+            for target in RECORDED_TARGETS:
+                socket.on(
+                    target,
+                    lambda arguments, target=target: out.write(
+                        json.dumps({"target": target, "arguments": arguments}) + "\n"
+                    ),
+                )
+            await socket.connect()
+            await asyncio.sleep(seconds)
+            await socket.disconnect()
+
+
+def _pascal_keys(value):
+    """Restore the device's C# member names, which MessagePack does not camelCase."""
+    if isinstance(value, dict):
+        return {
+            key[:1].upper() + key[1:] if isinstance(key, str) else key: _pascal_keys(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_pascal_keys(item) for item in value]
+    return value
+
+
+def _to_msgpack(message):
+    """Encode a recorded message the way the device would over MessagePack."""
+    arguments = _pascal_keys(message["arguments"])
+    if message["target"] == "frames" and arguments and isinstance(arguments[0], str):
+        arguments = [base64.b64decode(arguments[0])] + arguments[1:]
+    return _frame_msgpack([MESSAGE_INVOCATION, {}, None, message["target"], arguments])
+
+
+def _time_per_message(decode, frames, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for frame in frames:
+            for message in decode(frame):
+                # Frame colors arrive base64 encoded over JSON and as bytes
+                # over MessagePack; both end as bytes for the ring buffer.
+                if message["target"] == "frames":
+                    _frame_bytes(message["arguments"][0])
+    return (time.perf_counter() - started) / (iterations * len(frames))
+
+
+def decode(path, iterations=1000):
+    with open(path) as recording:
+        messages = [json.loads(line) for line in recording if line.strip()]
+    for target in RECORDED_TARGETS:
+        recorded = [m for m in messages if m["target"] == target]
+        if not recorded:
+            continue
+        text = [
+            json.dumps({"type": MESSAGE_INVOCATION, **m}) + RECORD_SEPARATOR
+            for m in recorded
+        ]
+        binary = [_to_msgpack(m) for m in recorded]
+        json_cost = _time_per_message(_decode, text, iterations)
+        msgpack_cost = _time_per_message(_decode_msgpack, binary, iterations)
+        print(
+            f"{target}: n={len(recorded)} "
+            f"json={json_cost * 1e6:.1f}us ({statistics.mean(map(len, text)):.0f}B) "
+            f"msgpack={msgpack_cost * 1e6:.1f}us ({statistics.mean(map(len, binary)):.0f}B)"
+        )
+
+
+if __name__ == "__main__":
+    command, args = sys.argv[1], sys.argv[2:]
+    if command == "transport":
+        asyncio.run(bench_transport(args[0], *map(int, args[1:])))
+    elif command == "record":
+        asyncio.run(record(args[0], float(args[1]), args[2]))
+    elif command == "decode":
+        decode(args[0], *map(int, args[1:]))
+    else:
+        print(__doc__)
@@ -1,30 +1,105 @@
 """Support for Glimmr."""
 from __future__ import annotations
-from glimmr import Glimmr
+from time import monotonic
+
+from homeassistant.components.camera import DOMAIN as CAMERA_DOMAIN
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_MAC
+from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME
 from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, LOGGER
-
-PLATFORMS = {LIGHT_DOMAIN}
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.discovery import async_load_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+import voluptuous as vol
+
+from .const import (
+    CONF_CONNECTIONS_PER_HOST,
+    CONF_DISCOVERY_DEBOUNCE,
+    CONF_GROUPS,
+    CONF_PROTOCOL,
+    CONF_UDP,
+    CONF_MEMBERS,
+    DATA_DISCOVERY_DEBOUNCE,
+    DEFAULT_CONNECTIONS_PER_HOST,
+    DEFAULT_DISCOVERY_DEBOUNCE,
+    DEFAULT_PROTOCOL,
+    DOMAIN,
+    LOGGER,
+    SIGNAL_COORDINATOR_ADDED,
+    STORAGE_VERSION,
+)
+from .coordinator import RESTORED_PROBE, GlimmrDataUpdateCoordinator, storage_key
+
+PLATFORMS = {CAMERA_DOMAIN, LIGHT_DOMAIN, SENSOR_DOMAIN}
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_DISCOVERY_DEBOUNCE, default=DEFAULT_DISCOVERY_DEBOUNCE
+                ): cv.positive_int,
+                vol.Optional(CONF_GROUPS, default=[]): [
+                    vol.Schema(
+                        {
+                            vol.Required(CONF_NAME): cv.string,
+                            vol.Required(CONF_MEMBERS): vol.All(
+                                cv.ensure_list, [cv.string]
+                            ),
+                        }
+                    )
+                ],
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Old way of setting up the glimmr_light component."""
     hass.data[DOMAIN] = {}
+    if DOMAIN in config:
+        hass.data[DATA_DISCOVERY_DEBOUNCE] = config[DOMAIN][CONF_DISCOVERY_DEBOUNCE]
+        if groups := config[DOMAIN][CONF_GROUPS]:
+            hass.async_create_task(
+                async_load_platform(
+                    hass, LIGHT_DOMAIN, DOMAIN, {CONF_GROUPS: groups}, config
+                )
+            )
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up the glimmr_light integration from a config entry."""
+    started = monotonic()
     ip_address = entry.data.get(CONF_HOST)
-    LOGGER.debug("Creating glimmr from async_setup_entry: %s", ip_address)
-    glimmr_dev = Glimmr(ip_address)
-    await glimmr_dev.update()
-    LOGGER.debug("Updated,using UID of " + entry.unique_id)
-    hass.data[DOMAIN][entry.unique_id] = glimmr_dev
+    LOGGER.debug("Creating glimmr coordinator from async_setup_entry: %s", ip_address)
+    coordinator = GlimmrDataUpdateCoordinator(
+        hass,
+        host=ip_address,
+        entry_id=entry.entry_id,
+        limit_per_host=entry.options.get(
+            CONF_CONNECTIONS_PER_HOST, DEFAULT_CONNECTIONS_PER_HOST
+        ),
+        use_udp=entry.options.get(CONF_UDP, False),
+        protocol=entry.options.get(CONF_PROTOCOL, DEFAULT_PROTOCOL),
+    )
+    # Start from a fresh config flow probe or the last known state when we
+    # have one, so an unreachable device does not hold up startup.
+    restored = await coordinator.async_restore(
+        entry.unique_id or entry.data.get(CONF_MAC)
+    )
+    if restored is None:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Setup is retried with a new coordinator; release this one's session.
+            await coordinator.async_stop()
+            raise
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     # For backwards compat, set unique ID
     if entry.unique_id is None:
@@ -34,6 +109,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     # Set up all platforms for this device/entry.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_COORDINATOR_ADDED, coordinator)
+
+    # The entry owns the device socket; entities on any platform subscribe to
+    # its events. Connect in the background so an unreachable device does
+    # not delay setup.
+    coordinator.async_start_socket()
+
+    # Spread the first live fetch and later polls across the scan interval.
+    # A config flow probe is as fresh as that fetch would be, so it is not
+    # fetched again before the regular poll.
+    if restored != RESTORED_PROBE:
+        coordinator.async_stagger_refresh()
+
+    coordinator.setup_time = monotonic() - started
+    LOGGER.debug("Set up %s in %.3fs", entry.title, coordinator.setup_time)
 
     # Reload entry when its updated.
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -45,15 +135,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload Glimmr config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        glimmr_dev: Glimmr = hass.data[DOMAIN][entry.entry_id]
+        coordinator: GlimmrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
         # Ensure disconnected and cleanup stop sub
-        await glimmr_dev.socket.stop()
+        await coordinator.async_stop()
         del hass.data[DOMAIN][entry.entry_id]
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when it changed."""
     await hass.config_entries.async_reload(entry.entry_id)
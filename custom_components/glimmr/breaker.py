@@ -0,0 +1,111 @@
+"""Per-device circuit breaker with latency-adaptive timeouts."""
+from __future__ import annotations
+
+from collections import deque
+from time import monotonic
+from typing import Any
+
+from .const import (
+    BREAKER_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_THRESHOLD,
+    LATENCY_SAMPLES,
+    TIMEOUT_MAX,
+    TIMEOUT_MIN,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Timeouts are this multiple of the 95th latency percentile
+TIMEOUT_FACTOR = 3
+# Latency samples required before the timeout adapts
+MIN_SAMPLES = 5
+
+
+class CircuitBreaker:
+    """Stop calling a device after repeated failures.
+
+    After ``threshold`` consecutive failures the breaker opens and calls fail
+    immediately. Once the backoff has passed, a single probe call is let
+    through: success closes the breaker, failure reopens it with twice the
+    backoff, up to ``max_backoff``.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: int = BREAKER_THRESHOLD,
+        backoff: float = BREAKER_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._retry_at = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until an open breaker lets a probe through."""
+        if self.state == STATE_CLOSED:
+            return 0.0
+        return max(0.0, self._retry_at - monotonic())
+
+    def allow(self) -> bool:
+        """Return if a call may be made now."""
+        if self.state == STATE_CLOSED:
+            return True
+        if (now := monotonic()) >= self._retry_at:
+            # Let one probe through; another may follow if it never reports back.
+            self.state = STATE_HALF_OPEN
+            self._retry_at = now + TIMEOUT_MAX
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        """Close the breaker and record the call's latency."""
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._latencies.append(latency)
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker when the threshold is reached."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            delay = min(self.backoff * 2**self.opened, self.max_backoff)
+            self.opened += 1
+            self.state = STATE_OPEN
+            self._retry_at = monotonic() + delay
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return a latency percentile over recent successful calls."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    @property
+    def timeout(self) -> float:
+        """Return a request timeout fitted to the device's observed latency."""
+        if len(self._latencies) < MIN_SAMPLES:
+            return TIMEOUT_MAX
+        p95 = self.percentile(0.95)
+        return min(TIMEOUT_MAX, max(TIMEOUT_MIN, p95 * TIMEOUT_FACTOR))
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return breaker state and latency percentiles."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in, 1),
+            "timeout": self.timeout,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+        }
@@ -0,0 +1,195 @@
+"""Support for Glimmr frame previews."""
+from __future__ import annotations
+
+import struct
+import zlib
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+import numpy as np
+
+from .const import (
+    DOMAIN,
+    PREVIEW_FRAME_WAIT,
+    PREVIEW_HEIGHT,
+    PREVIEW_IDLE_TIMEOUT,
+    PREVIEW_MAX_WIDTH,
+    PREVIEW_WIDTH,
+)
+from .coordinator import GlimmrDataUpdateCoordinator
+from .dispatcher import EVENT_FRAMES
+from .entity import GlimmrEntity
+from .frames import FrameLayout
+
+# Preview border thickness, as a fraction of the image height
+BORDER_FRACTION = 0.12
+# Brightness of the frame's average color filling the middle of the preview
+INTERIOR_LEVEL = 0.35
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up a Glimmr frame preview camera."""
+    coordinator: GlimmrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([GlimmrPreviewCamera(coordinator)])
+
+
+class GlimmrPreviewCamera(GlimmrEntity, Camera):
+    """Preview of the colors a Glimmr device is showing around the screen.
+
+    Images are only rendered when requested and are cached by frame
+    sequence number, so repeated requests for the same frame are free. The
+    frames stream itself is only subscribed while images are being requested.
+    Cache counters are kept on the coordinator for diagnostics.
+    """
+
+    _attr_icon = "mdi:television-ambient-light"
+
+    def __init__(self, coordinator: GlimmrDataUpdateCoordinator) -> None:
+        """Initialize the camera."""
+        super().__init__(coordinator)
+        Camera.__init__(self)
+        self.content_type = "image/png"
+        system_data = coordinator.glimmr.system_data
+        self._attr_name = f"{system_data.device_name} Preview"
+        self._attr_unique_id = f"{system_data.device_id}_preview"
+        self._cache: tuple[tuple[int, int, int], bytes] | None = None
+        self._release_stream: CALLBACK_TYPE | None = None
+        self._unsub_idle: CALLBACK_TYPE | None = None
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write coordinator updates that change availability."""
+        if self.coordinator.last_update_success != self._written_available:
+            self._written_available = self.coordinator.last_update_success
+            self.async_write_ha_state()
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return a PNG preview of the latest frame."""
+        frames = self.coordinator.frames
+        if self._async_keep_streaming():
+            # The stream was idle, so the buffered frame may be stale.
+            await frames.async_wait_frame(PREVIEW_FRAME_WAIT)
+        if (frame := frames.latest) is None or not len(frame):
+            return None
+
+        size = preview_size(width, height)
+        key = (frames.seq, *size)
+        stats = self.coordinator.preview
+        if self._cache is not None and self._cache[0] == key:
+            stats.cache_hits += 1
+            return self._cache[1]
+
+        # Copy the frame: the ring buffer slot may be reused while encoding.
+        image = await self.hass.async_add_executor_job(
+            encode_preview, frame.copy(), frames.layout, *size
+        )
+        self._cache = (key, image)
+        stats.frame_seq = key[0]
+        stats.encodes += 1
+        return image
+
+    @callback
+    def _async_keep_streaming(self) -> bool:
+        """Hold the frames stream open a while longer, returning if it was idle."""
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+        self._unsub_idle = async_call_later(
+            self.hass, PREVIEW_IDLE_TIMEOUT, self._async_stream_idle
+        )
+        if self._release_stream is not None:
+            return False
+        self._release_stream = self.coordinator.async_request_stream(EVENT_FRAMES)
+        return True
+
+    @callback
+    def _async_stream_idle(self, _now=None) -> None:
+        """Release the frames stream once nobody has requested an image for a while."""
+        self._unsub_idle = None
+        if self._release_stream is not None:
+            self._release_stream()
+            self._release_stream = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release the frames stream."""
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+        self._async_stream_idle()
+        await super().async_will_remove_from_hass()
+
+
+def preview_size(width: int | None, height: int | None) -> tuple[int, int]:
+    """Return the preview size for a requested size, keeping 16:9 when only one is given."""
+    if width is None and height is None:
+        return PREVIEW_WIDTH, PREVIEW_HEIGHT
+    if width is None:
+        width = height * 16 // 9
+    width = max(16, min(width, PREVIEW_MAX_WIDTH))
+    if height is None:
+        height = width * 9 // 16
+    return width, max(9, min(height, PREVIEW_MAX_WIDTH))
+
+
+def render_preview(
+    frame: np.ndarray, layout: FrameLayout, width: int, height: int
+) -> np.ndarray:
+    """Draw a frame's edge colors as the border of a ``(height, width, 3)`` image."""
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = (frame.mean(axis=0) * INTERIOR_LEVEL).astype(np.uint8)
+    edges = layout.edge_indices(len(frame))
+    if not edges:
+        # Unknown layout: show the frame as vertical stripes.
+        image[:] = frame[np.linspace(0, len(frame) - 1, width).round().astype(np.intp)]
+        return image
+
+    def _resample(indices: np.ndarray, length: int) -> np.ndarray:
+        return frame[indices[np.linspace(0, len(indices) - 1, length).round().astype(np.intp)]]
+
+    border = max(1, int(height * BORDER_FRACTION))
+    # Frames run counter-clockwise from the bottom right corner.
+    if len(edges["right"]):
+        image[:, width - border :] = _resample(edges["right"], height)[::-1, None]
+    if len(edges["top"]):
+        image[:border] = _resample(edges["top"], width)[None, ::-1]
+    if len(edges["left"]):
+        image[:, :border] = _resample(edges["left"], height)[:, None]
+    if len(edges["bottom"]):
+        image[height - border :] = _resample(edges["bottom"], width)[None]
+    return image
+
+
+def encode_preview(
+    frame: np.ndarray, layout: FrameLayout, width: int, height: int
+) -> bytes:
+    """Render and PNG-encode a frame preview."""
+    return encode_png(render_preview(frame, layout, width, height))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an RGB uint8 image as PNG."""
+    height, width, _ = image.shape
+    # Each scanline starts with filter type 0 (none).
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 3)
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + _chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + _chunk(b"IEND", b"")
+    )
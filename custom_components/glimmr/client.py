@@ -0,0 +1,158 @@
+"""Shared HTTP session for Glimmr clients."""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from glimmr import Glimmr, SystemData
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .const import DOMAIN, LOGGER, PROBE_TTL
+
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_SESSION_USERS = f"{DOMAIN}_session_users"
+DATA_CONNECTIONS = f"{DOMAIN}_connections"
+DATA_PROBES = f"{DOMAIN}_probes"
+
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse counters for one device."""
+
+    created: int = 0
+    reused: int = 0
+    last_reused: bool | None = None
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the keep-alive session shared by every Glimmr client.
+
+    The config flow, entry setup and polling all reuse connections from Home
+    Assistant's connector pool through this session.
+    """
+    if (session := hass.data.get(DATA_SESSION)) is not None and not session.closed:
+        return session
+
+    LOGGER.debug("Creating Glimmr session")
+    session = hass.data[DATA_SESSION] = async_create_clientsession(
+        hass, auto_cleanup=False, trace_configs=[_async_trace_config(hass)]
+    )
+
+    @callback
+    def _async_detach(_: Event) -> None:
+        session.detach()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_detach)
+    return session
+
+
+@callback
+def async_acquire_session(hass: HomeAssistant, host: str) -> aiohttp.ClientSession:
+    """Return the shared session for a configured device, tracking its use."""
+    users: Counter[str] = hass.data.setdefault(DATA_SESSION_USERS, Counter())
+    users[host] += 1
+    hass.data.setdefault(DATA_CONNECTIONS, {}).setdefault(host, ConnectionStats())
+    return async_get_session(hass)
+
+
+@callback
+def async_release_session(hass: HomeAssistant, host: str) -> None:
+    """Stop tracking a device, detaching the session once no device uses it."""
+    users: Counter[str] = hass.data.get(DATA_SESSION_USERS, Counter())
+    users[host] -= 1
+    if users[host] > 0:
+        return
+    del users[host]
+    hass.data.get(DATA_CONNECTIONS, {}).pop(host, None)
+    if not users and (session := hass.data.pop(DATA_SESSION, None)) is not None:
+        LOGGER.debug("Detaching unused Glimmr session")
+        session.detach()
+
+
+@callback
+def async_create_glimmr(hass: HomeAssistant, host: str) -> Glimmr:
+    """Create a Glimmr client using the shared session."""
+    glimmr = Glimmr(host)
+    glimmr.LOGGER = LOGGER
+    glimmr.session = async_get_session(hass)
+    return glimmr
+
+
+@callback
+def async_store_probe(hass: HomeAssistant, glimmr: Glimmr) -> None:
+    """Keep a config flow probe's result briefly for the entry setup to reuse."""
+    probes: dict[str, tuple[float, SystemData, dict[str, int]]] = hass.data.setdefault(
+        DATA_PROBES, {}
+    )
+    scenes = dict(getattr(glimmr, "ambient_scenes", None) or {})
+    probes[glimmr.system_data.device_id] = (monotonic(), glimmr.system_data, scenes)
+
+
+@callback
+def async_pop_probe(
+    hass: HomeAssistant, device_id: str | None
+) -> tuple[SystemData, dict[str, int]] | None:
+    """Return a recent probe result for a device, consuming it."""
+    probes: dict[str, Any] = hass.data.get(DATA_PROBES, {})
+    now = monotonic()
+    for key in [key for key, probe in probes.items() if now - probe[0] > PROBE_TTL]:
+        del probes[key]
+    if device_id is None or (probe := probes.pop(device_id, None)) is None:
+        return None
+    return probe[1], probe[2]
+
+
+@callback
+def async_connection_stats(hass: HomeAssistant, host: str) -> ConnectionStats:
+    """Return connection reuse counters for a configured device."""
+    return hass.data.get(DATA_CONNECTIONS, {}).get(host) or ConnectionStats()
+
+
+def _async_trace_config(hass: HomeAssistant) -> aiohttp.TraceConfig:
+    """Return a trace config recording whether requests reused a connection."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        context.host = params.url.host
+        context.reused = None
+
+    async def on_connection_reuseconn(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params
+    ) -> None:
+        context.reused = True
+
+    async def on_connection_create_end(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params
+    ) -> None:
+        context.reused = False
+
+    async def on_request_end(
+        _session: aiohttp.ClientSession, context: SimpleNamespace, _params
+    ) -> None:
+        # Only configured devices are counted, not hosts probed by a scan.
+        if context.reused is None or (
+            stats := hass.data.get(DATA_CONNECTIONS, {}).get(context.host)
+        ) is None:
+            return
+        stats.last_reused = context.reused
+        if context.reused:
+            stats.reused += 1
+        else:
+            stats.created += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
@@ -0,0 +1,128 @@
+"""Per-device command scheduling for Glimmr."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+
+from .const import LOGGER
+
+# Lower values run first.
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 10
+
+COMMAND_COLOR = "color"
+COMMAND_MODE = "mode"
+COMMAND_SCENE = "scene"
+COMMAND_REFRESH = "refresh"
+
+DEFAULT_MAX_IN_FLIGHT = 1
+
+
+@dataclass
+class _Command:
+    """A queued request to a device."""
+
+    kind: str
+    call: Callable[[], Awaitable[Any]]
+    priority: int
+    seq: int
+    future: asyncio.Future = field(repr=False)
+
+
+class GlimmrCommandQueue:
+    """Run device requests in priority order, keeping only the newest of each kind.
+
+    Submitting a command while one of the same kind is still waiting replaces
+    the waiting call; every caller then awaits the outcome of the newest one.
+    """
+
+    def __init__(self, *, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        """Initialize the command queue."""
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.dropped = 0
+        self.executed = 0
+        self._pending: dict[str, _Command] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._seq = count()
+
+    @property
+    def depth(self) -> int:
+        """Return the number of commands waiting to run."""
+        return len(self._pending)
+
+    async def async_submit(
+        self,
+        kind: str,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        priority: int = PRIORITY_USER,
+    ) -> Any:
+        """Queue a call and wait for the newest call of its kind to finish."""
+        if (command := self._pending.get(kind)) is not None:
+            LOGGER.debug("Superseding queued %s command", kind)
+            command.call = call
+            command.priority = min(command.priority, priority)
+            command.seq = next(self._seq)
+            self.dropped += 1
+        else:
+            command = _Command(
+                kind=kind,
+                call=call,
+                priority=priority,
+                seq=next(self._seq),
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._pending[kind] = command
+        self._pump()
+        return await asyncio.shield(command.future)
+
+    async def async_stop(self) -> None:
+        """Cancel running and waiting commands."""
+        for command in self._pending.values():
+            command.future.cancel()
+        self._pending.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return queue counters."""
+        return {
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "executed": self.executed,
+            "dropped": self.dropped,
+        }
+
+    def _pump(self) -> None:
+        """Start waiting commands while in-flight capacity is available."""
+        while self._pending and self.in_flight < self.max_in_flight:
+            command = min(self._pending.values(), key=lambda c: (c.priority, c.seq))
+            del self._pending[command.kind]
+            self.in_flight += 1
+            # Hold a reference so running commands are not garbage collected.
+            task = asyncio.get_running_loop().create_task(self._run(command))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, command: _Command) -> None:
+        """Execute a command and resolve everyone waiting on it."""
+        try:
+            result = await command.call()
+        except asyncio.CancelledError:
+            command.future.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            command.future.set_exception(err)
+        else:
+            command.future.set_result(result)
+        finally:
+            self.in_flight -= 1
+            self.executed += 1
+            self._pump()
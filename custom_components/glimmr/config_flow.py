@@ -1,10 +1,13 @@
 """Config flow to configure the Glimmr integration."""
 from __future__ import annotations
 
+import ipaddress
+from time import monotonic
 from typing import Any
 
 import voluptuous as vol
-from glimmr import Glimmr, GlimmrConnectionError
+from glimmr import GlimmrConnectionError
+from homeassistant.components import network
 from homeassistant.config_entries import (
     SOURCE_ZEROCONF,
     ConfigEntry,
@@ -16,7 +19,23 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.typing import DiscoveryInfoType
 
-from .const import DOMAIN, LOGGER
+from .client import async_create_glimmr, async_get_session, async_store_probe
+from .const import (
+    CONF_CONNECTIONS_PER_HOST,
+    CONF_NETWORK,
+    CONF_PROTOCOL,
+    CONF_UDP,
+    DATA_DISCOVERY_DEBOUNCE,
+    DEFAULT_CONNECTIONS_PER_HOST,
+    DEFAULT_DISCOVERY_DEBOUNCE,
+    DEFAULT_PROTOCOL,
+    DOMAIN,
+    LOGGER,
+)
+from .scanner import DiscoveredGlimmr, async_scan_network
+from .signalr import PROTOCOL_JSON, PROTOCOL_MESSAGEPACK
+
+DATA_DISCOVERY_SEEN = f"{DOMAIN}_discovery_seen"
 
 
 class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
@@ -24,6 +43,10 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredGlimmr] = {}
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> GlimmrOptionsFlowHandler:
@@ -34,12 +57,97 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle a flow initiated by the user."""
+        if user_input is not None:
+            return await self.async_step_host(user_input)
+        return self.async_show_menu(step_id="user", menu_options=["host", "scan"])
+
+    async def async_step_host(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set up a device by its host."""
+        if user_input is not None and "/" in user_input.get(CONF_HOST, ""):
+            return await self.async_step_scan({CONF_NETWORK: user_input[CONF_HOST]})
         return await self._handle_config_flow(user_input)
 
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a subnet for Glimmr devices when mDNS is unavailable."""
+        errors = {}
+        if user_input is not None:
+            try:
+                found = await async_scan_network(
+                    async_get_session(self.hass), user_input[CONF_NETWORK]
+                )
+            except ValueError:
+                errors["base"] = "invalid_network"
+            else:
+                configured = self._async_current_ids()
+                self._discovered = {
+                    device.host: device
+                    for device in found
+                    if device.device_id not in configured
+                }
+                if not self._discovered:
+                    return self.async_abort(reason="no_devices_found")
+                return await self.async_step_pick()
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_NETWORK, default=await self._async_default_network()
+                    ): str
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick one of the scanned devices."""
+        if user_input is not None:
+            return await self._handle_config_flow({CONF_HOST: user_input[CONF_HOST]})
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(
+                        {
+                            host: f"{device.name} ({host})"
+                            for host, device in self._discovered.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+    async def _async_default_network(self) -> str:
+        """Return the /24 around Home Assistant's own address."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+        except Exception:  # pylint: disable=broad-except
+            return ""
+        return str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+
     async def async_step_zeroconf(
         self, discovery_info: DiscoveryInfoType
     ) -> FlowResult:
         """Handle zeroconf discovery."""
+        ip_address = discovery_info["host"]
+        mac = discovery_info["properties"].get(CONF_MAC)
+
+        # Known devices are resolved without touching the network; an IP
+        # change only updates the existing entry's host.
+        if mac:
+            await self.async_set_unique_id(mac)
+            self._abort_if_unique_id_configured(updates={CONF_HOST: ip_address})
+
+        if self._async_recently_discovered(ip_address):
+            return self.async_abort(reason="already_in_progress")
 
         # Hostname is format: glimmr-xxx.local.
         host = discovery_info["hostname"].rstrip(".")
@@ -47,7 +155,7 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
 
         self.context.update(
             {
-                CONF_HOST: discovery_info["host"],
+                CONF_HOST: ip_address,
                 CONF_NAME: name,
                 CONF_MAC: discovery_info["properties"].get(CONF_MAC),
                 "title_placeholders": {"name": name},
@@ -57,6 +165,16 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
         # Prepare configuration flow
         return await self._handle_config_flow(discovery_info, True)
 
+    @callback
+    def _async_recently_discovered(self, host: str) -> bool:
+        """Return if host announced itself within the debounce window, then record it."""
+        seen: dict[str, float] = self.hass.data.setdefault(DATA_DISCOVERY_SEEN, {})
+        window = self.hass.data.get(DATA_DISCOVERY_DEBOUNCE, DEFAULT_DISCOVERY_DEBOUNCE)
+        now = monotonic()
+        last = seen.get(host)
+        seen[host] = now
+        return last is not None and now - last < window
+
     async def async_step_zeroconf_confirm(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -84,9 +202,7 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
 
         if user_input.get(CONF_MAC) is None or not prepare:
             LOGGER.debug("Creating glimmr from config flow (NO mac/not prepare) " + user_input[CONF_HOST])
-            glimmr = Glimmr(user_input[CONF_HOST])
-            await glimmr.update()
-            glimmr.LOGGER = LOGGER
+            glimmr = async_create_glimmr(self.hass, user_input[CONF_HOST])
             try:
                 await glimmr.update()
             except GlimmrConnectionError:
@@ -94,6 +210,7 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
                     return self.async_abort(reason="cannot_connect")
                 return self._show_setup_form({"base": "cannot_connect"})
             user_input[CONF_MAC] = glimmr.system_data.device_id
+            async_store_probe(self.hass, glimmr)
 
         # Check if already configured
         await self.async_set_unique_id(user_input[CONF_MAC])
@@ -114,7 +231,7 @@ class GlimmrFlowHandler(ConfigFlow, domain=DOMAIN):
     def _show_setup_form(self, errors: dict | None = None) -> FlowResult:
         """Show the setup form to the user."""
         return self.async_show_form(
-            step_id="user",
+            step_id="host",
             data_schema=vol.Schema({vol.Required(CONF_HOST): str}),
             errors=errors or {},
         )
@@ -144,5 +261,24 @@ class GlimmrOptionsFlowHandler(OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
-            step_id="init"
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_CONNECTIONS_PER_HOST,
+                        default=self.config_entry.options.get(
+                            CONF_CONNECTIONS_PER_HOST, DEFAULT_CONNECTIONS_PER_HOST
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                    vol.Optional(
+                        CONF_UDP, default=self.config_entry.options.get(CONF_UDP, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_PROTOCOL,
+                        default=self.config_entry.options.get(
+                            CONF_PROTOCOL, DEFAULT_PROTOCOL
+                        ),
+                    ): vol.In([PROTOCOL_JSON, PROTOCOL_MESSAGEPACK]),
+                }
+            ),
         )
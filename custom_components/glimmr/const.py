@@ -8,5 +8,100 @@ DEFAULT_NAME = "Glimmr"
 LOGGER = logging.getLogger(__package__)
 SCAN_INTERVAL = timedelta(seconds=10)
 
+# Polling intervals while the socket is down, by device activity
+POLL_IDLE_INTERVAL = timedelta(minutes=2)
+POLL_ACTIVE_INTERVAL = timedelta(seconds=5)
+POLL_BOOST_INTERVAL = timedelta(seconds=2)
+# Seconds polling stays boosted after a user command
+POLL_BOOST_DURATION = 30
+# Video, audio and audio/video modes, whose state changes with the content
+ACTIVE_MODES = frozenset({1, 2, 4})
+
+# Seconds during which repeated mDNS announcements from a host are ignored
+CONF_DISCOVERY_DEBOUNCE = "discovery_debounce"
+DATA_DISCOVERY_DEBOUNCE = f"{DOMAIN}_discovery_debounce"
+DEFAULT_DISCOVERY_DEBOUNCE = 300
+
+# Subnet scanning when mDNS is unavailable
+CONF_NETWORK = "network"
+SCAN_CONCURRENCY = 64
+SCAN_MAX_HOSTS = 1024
+SCAN_TIMEOUT = 1.5
+
+# Simultaneous HTTP requests per device
+CONF_CONNECTIONS_PER_HOST = "connections_per_host"
+DEFAULT_CONNECTIONS_PER_HOST = 2
+
+# Optional DreamScreen-style UDP path for color and mode changes
+CONF_UDP = "udp"
+UDP_PORT = 8888
+UDP_ACK_TIMEOUT = 0.25
+
+# Circuit breaker for unreachable devices, in seconds
+BREAKER_THRESHOLD = 3
+BREAKER_BACKOFF = 10
+BREAKER_MAX_BACKOFF = 300
+LATENCY_SAMPLES = 50
+TIMEOUT_MIN = 1.0
+TIMEOUT_MAX = 8.0
+
+# Socket reconnect backoff, in seconds
+RECONNECT_MIN_DELAY = 2
+RECONNECT_MAX_DELAY = 300
+# Connections open at least this long reset the backoff
+RECONNECT_STABLE = 60
+
+# Hub protocol used by the device socket
+CONF_PROTOCOL = "protocol"
+DEFAULT_PROTOCOL = "json"
+
+# Seconds a config flow probe may be reused by the entry setup that follows it
+PROBE_TTL = 60
+
+# Last-known device state persisted between restarts
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Seconds to wait for a device to confirm an optimistic state change
+CONFIRM_TIMEOUT = 30
+
+# Number of pushed frames kept in each device's ring buffer
+FRAME_BUFFER_SIZE = 8
+
+# Camera previews rendered from pushed frames
+PREVIEW_WIDTH = 320
+PREVIEW_HEIGHT = 180
+PREVIEW_MAX_WIDTH = 1280
+# Seconds the frames stream stays subscribed after the last image request
+PREVIEW_IDLE_TIMEOUT = 30
+# Seconds to wait for a fresh frame when the stream was idle
+PREVIEW_FRAME_WAIT = 1.0
+
+# Window over which pushed stats are aggregated before sensors are written
+STATS_INTERVAL = timedelta(seconds=30)
+
+# Glimmr groups declared in YAML, fanned out to their members at once
+CONF_GROUPS = "groups"
+CONF_MEMBERS = "members"
+GROUP_MEMBER_TIMEOUT = 5
+SIGNAL_COORDINATOR_ADDED = f"{DOMAIN}_coordinator_added"
+
+# Effects rendered by the integration and streamed to the device
+MODE_STREAMING = 5
+STREAM_FPS = 30
+STREAM_MAX_FPS = 60
+STREAM_PORT = 21324
+
+# Other lights following the captured screen colors
+MIRROR_RATE = 2.0
+MIRROR_MAX_RATE = 10.0
+MIRROR_THRESHOLD = 5.0
+MIRROR_SAMPLE_INTERVAL = 0.05
+MIRROR_SMOOTHING = 0.5
+MIRROR_RATE_WINDOW = 10
+
 # Services
 SERVICE_EFFECT = "effect"
+SERVICE_STREAM = "stream"
+SERVICE_MIRROR = "mirror"
+SERVICE_STOP_MIRROR = "stop_mirror"
@@ -0,0 +1,674 @@
+"""DataUpdateCoordinator for Glimmr."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Collection
+from datetime import timedelta
+from functools import partial
+from itertools import count
+import random
+from time import monotonic
+from typing import Any
+
+import async_timeout
+from glimmr import SystemData
+from glimmr.exceptions import (
+    GlimmrConnectionError,
+    GlimmrEmptyResponseError,
+    GlimmrError,
+)
+from glimmr.models import StatData
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .breaker import CircuitBreaker
+from .dispatcher import (
+    EVENT_FRAMES,
+    EVENT_MODE,
+    EVENT_STATS,
+    EVENT_STORE,
+    GlimmrDispatcher,
+    GlimmrEvent,
+)
+from .client import (
+    async_acquire_session,
+    async_connection_stats,
+    async_create_glimmr,
+    async_pop_probe,
+    async_release_session,
+)
+from .commands import (
+    COMMAND_COLOR,
+    COMMAND_MODE,
+    COMMAND_REFRESH,
+    COMMAND_SCENE,
+    PRIORITY_BACKGROUND,
+    GlimmrCommandQueue,
+)
+from .const import (
+    ACTIVE_MODES,
+    CONFIRM_TIMEOUT,
+    DEFAULT_CONNECTIONS_PER_HOST,
+    DEFAULT_PROTOCOL,
+    DOMAIN,
+    LOGGER,
+    MODE_STREAMING,
+    POLL_ACTIVE_INTERVAL,
+    POLL_BOOST_DURATION,
+    POLL_BOOST_INTERVAL,
+    POLL_IDLE_INTERVAL,
+    SCAN_INTERVAL,
+    STATS_INTERVAL,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STREAM_FPS,
+)
+from .frames import FrameLayout, FrameStream, FrameSummary, PreviewStats
+from .models import GlimmrState
+from .mirror import AmbientMirror
+from .renderer import Effect, EffectRenderer
+from .scenes import SceneCatalog, catalog_key
+from .stats import StatsAggregator
+from .signalr import GlimmrSocket
+from .supervisor import SocketSupervisor
+from .udp import GlimmrUdpTransport, color_packets, mode_packet
+
+# Sources of the initial data returned by async_restore
+RESTORED_PROBE = "probe"
+RESTORED_SNAPSHOT = "snapshot"
+
+# Fields a store push must carry to be applied without a follow-up fetch.
+PUSH_REQUIRED_KEYS = frozenset(
+    {"deviceId", "deviceMode", "autoDisabled", "ambientColor", "ambientScene"}
+)
+
+
+class GlimmrDataUpdateCoordinator(DataUpdateCoordinator[SystemData]):
+    """Fetch Glimmr system data once per device and share it with every entity."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        host: str,
+        entry_id: str | None = None,
+        limit_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        use_udp: bool = False,
+        protocol: str = DEFAULT_PROTOCOL,
+    ) -> None:
+        """Initialize the Glimmr data updater."""
+        async_acquire_session(hass, host)
+        self.glimmr = async_create_glimmr(hass, host)
+        self._http_slots = asyncio.Semaphore(limit_per_host)
+        self.udp = GlimmrUdpTransport(host) if use_udp else None
+        self.http_latency: float | None = None
+        self.breaker = CircuitBreaker()
+        # Resolved when the device confirms a key of the UDP command in flight
+        self._confirmed: asyncio.Future | None = None
+        self._confirm_keys: frozenset[str] = frozenset()
+        self._refresh_task: asyncio.Task | None = None
+        self._unsub_stagger: CALLBACK_TYPE | None = None
+        self._push_gap = False
+        self._boost_until = 0.0
+        self.commands = GlimmrCommandQueue()
+        self.confirm_latency: float | None = None
+        self._pending_confirm: dict[str, tuple[Any, float]] = {}
+        # Per key: the newest command applying a value optimistically, and
+        # the last value the device acknowledged to roll back to.
+        self._rollback: dict[str, tuple[int, Any]] = {}
+        self._tokens = count()
+        self.scenes = SceneCatalog.build(None, None)
+        self.state: GlimmrState | None = None
+        self.frames = FrameStream(FrameLayout(0, 0, 0, 0, 0, 0))
+        self.preview = PreviewStats()
+        self.renderer = EffectRenderer(host, on_stop=self.async_update_listeners)
+        self.stats = StatsAggregator()
+        self._stats_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_stats: CALLBACK_TYPE | None = None
+        self.setup_time: float | None = None
+        self._store: Store | None = None
+        self._saved_key: tuple[GlimmrState, Any] | None = None
+        if entry_id is not None:
+            self._store = Store(hass, STORAGE_VERSION, storage_key(entry_id))
+        self.socket = GlimmrSocket(host, async_get_clientsession(hass), protocol)
+        self.events = GlimmrDispatcher(self.socket)
+        self.events.subscribe(EVENT_STORE, self.async_handle_push)
+        self.events.subscribe(EVENT_MODE, self.async_handle_mode)
+        # High-volume streams are only received while something consumes them.
+        self._stream_handlers: dict[GlimmrEvent, Callable[[Any], None]] = {
+            EVENT_FRAMES: self.frames.async_handle_frame,
+            EVENT_STATS: self.async_handle_stats,
+        }
+        self._stream_demand: dict[GlimmrEvent, int] = {}
+        self._unsub_streams: dict[GlimmrEvent, CALLBACK_TYPE] = {}
+        self.mirror = AmbientMirror(hass, self.frames, self.async_subscribe_frames)
+        self._unsub_socket = [
+            self.socket.on_open(self._async_socket_opened),
+            self.socket.on_close(self._async_socket_closed),
+        ]
+        self.supervisor = SocketSupervisor(self.socket)
+
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"{DOMAIN} {host}",
+            update_interval=SCAN_INTERVAL,
+        )
+
+    async def _async_update_data(self) -> SystemData:
+        """Fetch data from Glimmr, sharing a single in-flight request."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_task(
+                self.commands.async_submit(
+                    COMMAND_REFRESH, self._async_fetch, priority=PRIORITY_BACKGROUND
+                )
+            )
+        try:
+            return await asyncio.shield(self._refresh_task)
+        except (GlimmrError, GlimmrEmptyResponseError, asyncio.TimeoutError) as err:
+            raise UpdateFailed(f"Error communicating with Glimmr: {err}") from err
+
+    async def _async_fetch(self) -> SystemData:
+        """Pull the latest system data and scene list from the device."""
+        await self._async_guarded(self.glimmr.update)
+        LOGGER.debug(
+            "Fetched %s (connection reused: %s)",
+            self.name,
+            async_connection_stats(self.hass, self.glimmr.host).last_reused,
+        )
+        self._async_update_scenes()
+        self._async_confirm(self.glimmr.system_data)
+        self._async_schedule_save()
+        self._async_adapt_interval(self.glimmr.system_data)
+        return self.glimmr.system_data
+
+    @callback
+    def _async_adapt_interval(self, data: SystemData | None) -> None:
+        """Fit the polling interval to the device's activity.
+
+        Only applies while polling; an open socket keeps polling disabled.
+        """
+        if self.socket.connected:
+            return
+        interval = poll_interval(data, boosted=monotonic() < self._boost_until)
+        if interval != self.update_interval:
+            LOGGER.debug("Polling %s every %s", self.name, interval)
+            self.update_interval = interval
+
+    async def async_restore(self, device_id: str | None = None) -> str | None:
+        """Load initial data without contacting the device.
+
+        A config flow probe for ``device_id`` from moments ago is preferred;
+        otherwise the last known snapshot is loaded from storage. Returns
+        ``RESTORED_PROBE`` or ``RESTORED_SNAPSHOT`` for whichever was set as
+        current data, or None.
+        """
+        if (probe := async_pop_probe(self.hass, device_id)) is not None:
+            system_data, scenes = probe
+            LOGGER.debug("Reusing config flow probe for %s", self.name)
+            self._async_set_initial_data(system_data, scenes)
+            self._async_schedule_save()
+            return RESTORED_PROBE
+
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return None
+        try:
+            system_data = SystemData.from_dict(stored["system_data"])
+            scenes = dict(stored["ambient_scenes"])
+        except (KeyError, TypeError, AttributeError) as err:
+            LOGGER.debug("Ignoring unreadable snapshot for %s: %s", self.name, err)
+            return None
+        LOGGER.debug("Restored %s from stored snapshot", self.name)
+        self._async_set_initial_data(system_data, scenes)
+        self._saved_key = self._persisted_key()
+        return RESTORED_SNAPSHOT
+
+    @callback
+    def _async_set_initial_data(
+        self, system_data: SystemData, scenes: dict[str, int]
+    ) -> None:
+        """Adopt data obtained outside of a refresh as the current state."""
+        self.glimmr.system_data = system_data
+        self.glimmr.ambient_scenes = scenes
+        self._async_update_scenes()
+        self.data = system_data
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Persist the current snapshot after a short delay, if it changed.
+
+        Every delayed save restarts the delay, so saving on each push would
+        postpone the write indefinitely on a busy device.
+        """
+        if self._store is None or self.glimmr.system_data is None:
+            return
+        if (key := self._persisted_key()) != self._saved_key:
+            self._saved_key = key
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+    def _persisted_key(self) -> tuple[GlimmrState, Any]:
+        """Return what identifies the persisted state and scene catalog."""
+        return GlimmrState.from_system_data(self.glimmr.system_data), self.scenes.key
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data persisted between restarts."""
+        return {
+            "system_data": self.glimmr.system_data.to_dict(),
+            "ambient_scenes": dict(getattr(self.glimmr, "ambient_scenes", None) or {}),
+        }
+
+    async def async_set_mode(self, mode: int) -> None:
+        """Queue a device mode change."""
+        packet = mode_packet(mode)
+        await self._async_command(
+            COMMAND_MODE,
+            partial(self.glimmr.set_mode, mode),
+            packets=[packet] if packet else None,
+            device_mode=mode,
+        )
+
+    async def async_set_ambient_scene(self, scene: int) -> None:
+        """Queue an ambient scene change."""
+        await self._async_command(
+            COMMAND_SCENE,
+            partial(self.glimmr.set_ambient_scene, scene),
+            ambient_scene=scene,
+        )
+
+    async def async_set_ambient_color(self, color: str) -> None:
+        """Queue an ambient color change."""
+        await self._async_command(
+            COMMAND_COLOR,
+            partial(self.glimmr.set_ambient_color, color),
+            packets=color_packets(color),
+            ambient_color=color.lstrip("#"),
+        )
+
+    async def async_stream_effect(
+        self, name: str, effect: Effect, fps: float = STREAM_FPS
+    ) -> None:
+        """Switch the device to streaming and render an effect for it."""
+        # Check before switching modes, so a failure leaves the device as it was.
+        if not self.frames.layout.led_count:
+            raise HomeAssistantError(f"{self.name} reports no LEDs to stream to")
+        await self.async_set_mode(MODE_STREAMING)
+        await self.renderer.async_start(name, effect, self.frames.layout, fps)
+        self.async_update_listeners()
+
+    async def _async_command(
+        self,
+        kind: str,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        packets: list[bytes] | None = None,
+        **expected: Any,
+    ) -> None:
+        """Apply the expected state optimistically, then send the command.
+
+        If the device rejects the command, each value it set is rolled back
+        to the last value the device acknowledged, unless a newer command has
+        since set that value. Otherwise values are replaced by the next push
+        or refresh.
+        """
+        if self.renderer.running:
+            await self.renderer.async_stop()
+        token = next(self._tokens)
+        if self.data is not None:
+            started = monotonic()
+            for key, value in expected.items():
+                acked = (
+                    self._rollback[key][1]
+                    if key in self._rollback
+                    else getattr(self.data, key)
+                )
+                self._rollback[key] = (token, acked)
+                self._pending_confirm[key] = (value, started)
+                setattr(self.data, key, value)
+            self.async_update_listeners()
+
+        try:
+            await self.commands.async_submit(
+                kind, self._deliver(call, packets, frozenset(expected))
+            )
+        except GlimmrError:
+            rolled_back = False
+            for key in expected:
+                owner, acked = self._rollback.get(key, (None, None))
+                if owner != token:
+                    continue
+                del self._rollback[key]
+                self._pending_confirm.pop(key, None)
+                if self.data is not None:
+                    setattr(self.data, key, acked)
+                    rolled_back = True
+            if rolled_back:
+                LOGGER.debug("Rolled back optimistic %s on %s", kind, self.name)
+                self.async_update_listeners()
+            raise
+
+        for key, value in expected.items():
+            if (owner := self._rollback.get(key, (None,))[0]) == token:
+                del self._rollback[key]
+            elif owner is not None:
+                # A newer command is still pending; it rolls back to this value.
+                self._rollback[key] = (owner, value)
+        if not self.socket.connected:
+            self._boost_until = monotonic() + POLL_BOOST_DURATION
+            self._async_adapt_interval(self.data)
+            await self.async_request_refresh()
+
+    def _deliver(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        packets: list[bytes] | None,
+        keys: frozenset[str] = frozenset(),
+    ) -> Callable[[], Awaitable[Any]]:
+        """Return a call sending packets over UDP, falling back to HTTP.
+
+        A UDP send counts as delivered when the device answers the datagram
+        or confirms the expected value of one of ``keys`` before the ack
+        timeout. Confirmations of other commands' keys do not count.
+        """
+
+        async def _async_deliver() -> Any:
+            if self.udp is not None and packets:
+                self._confirmed = self.hass.loop.create_future()
+                self._confirm_keys = keys
+                try:
+                    if await self.udp.async_send(packets, self._confirmed):
+                        return None
+                finally:
+                    self._confirmed = None
+                    self._confirm_keys = frozenset()
+                LOGGER.debug("No UDP acknowledgement from %s, using HTTP", self.name)
+            started = monotonic()
+            result = await self._async_guarded(call)
+            self.http_latency = monotonic() - started
+            return result
+
+        return _async_deliver
+
+    async def _async_guarded(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Make a device request through the circuit breaker.
+
+        Requests fail immediately while the breaker is open, and otherwise
+        use a timeout fitted to the device's recent latency. The timeout
+        bounds the whole call, including the library's own retries.
+        """
+        if not self.breaker.allow():
+            raise GlimmrConnectionError(
+                f"{self.name} is unreachable, retrying in {self.breaker.retry_in:.0f}s"
+            )
+        timeout = self.breaker.timeout
+        self.glimmr.request_timeout = timeout
+        async with self._http_slots:
+            started = monotonic()
+            try:
+                async with async_timeout.timeout(timeout):
+                    result = await call()
+            except asyncio.TimeoutError as err:
+                self.breaker.record_failure()
+                raise GlimmrConnectionError(
+                    f"{self.name} did not answer within {timeout:.1f}s"
+                ) from err
+            except GlimmrConnectionError:
+                self.breaker.record_failure()
+                raise
+            except GlimmrError:
+                # The device answered, so it is reachable.
+                self.breaker.record_success(monotonic() - started)
+                raise
+        self.breaker.record_success(monotonic() - started)
+        return result
+
+    @callback
+    def _async_update_scenes(self) -> None:
+        """Rebuild the scene catalog when the scene set or firmware changes."""
+        scenes = getattr(self.glimmr, "ambient_scenes", None)
+        version = getattr(self.glimmr.system_data, "version", None)
+        if catalog_key(version, scenes) != self.scenes.key:
+            LOGGER.debug("Rebuilding scene catalog for %s", self.name)
+            self.scenes = SceneCatalog.build(version, scenes)
+
+    @callback
+    def _async_confirm(
+        self, data: SystemData, keys: Collection[str] | None = None
+    ) -> None:
+        """Reconcile pending optimistic values against device-reported data.
+
+        Pushes that report a single field pass it as ``keys``, as every other
+        field of ``data`` may still hold an optimistic value.
+        """
+        now = monotonic()
+        for key, (expected, started) in list(self._pending_confirm.items()):
+            if keys is not None and key not in keys:
+                continue
+            if _normalize(getattr(data, key, None)) == _normalize(expected):
+                self.confirm_latency = now - started
+                LOGGER.debug(
+                    "%s confirmed %s after %.3fs", self.name, key, self.confirm_latency
+                )
+                del self._pending_confirm[key]
+                if (
+                    key in self._confirm_keys
+                    and self._confirmed is not None
+                    and not self._confirmed.done()
+                ):
+                    self._confirmed.set_result(None)
+            elif now - started > CONFIRM_TIMEOUT:
+                LOGGER.debug("%s did not confirm %s=%s", self.name, key, expected)
+                del self._pending_confirm[key]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Refresh the state snapshot, then notify listeners."""
+        self.state = GlimmrState.from_system_data(self.data) if self.data else None
+        if self.data:
+            self.frames.async_set_layout(FrameLayout.from_system_data(self.data))
+            if self.renderer.running and self.data.device_mode != MODE_STREAMING:
+                LOGGER.debug("%s left streaming mode, stopping effect", self.name)
+                self.hass.async_create_task(self.renderer.async_stop())
+        super().async_update_listeners()
+
+    @callback
+    def async_handle_push(self, store: dict[str, Any] | None) -> None:
+        """Apply an ``olo`` store push to the device state without network I/O.
+
+        Falls back to a full refresh when the payload lacks required fields or
+        pushes may have been missed since the socket was last closed.
+        """
+        system = store.get("systemData") if isinstance(store, dict) else None
+        if (
+            self._push_gap
+            or not isinstance(system, dict)
+            or not PUSH_REQUIRED_KEYS.issubset(system)
+        ):
+            LOGGER.debug("Incomplete or out of sequence push for %s", self.name)
+            self._push_gap = False
+            self.hass.async_create_task(self.async_request_refresh())
+            return
+
+        self.glimmr.system_data = SystemData.from_dict(system)
+        if (scenes := store.get("ambientScenes")) is not None:
+            self.glimmr.load_scenes(scenes)
+        self._async_update_scenes()
+        if (stats := store.get("stats")) is not None:
+            self.glimmr.stats = StatData.from_dict(stats)
+            self.stats.add(stats)
+        self._async_confirm(self.glimmr.system_data)
+        self._async_schedule_save()
+        self.async_set_updated_data(self.glimmr.system_data)
+
+    @callback
+    def async_handle_stats(self, stats: dict[str, Any] | None) -> None:
+        """Fold a ``stats`` push into the current aggregation window."""
+        if isinstance(stats, dict):
+            self.stats.add(stats)
+
+    @callback
+    def async_request_stream(self, event: GlimmrEvent) -> CALLBACK_TYPE:
+        """Receive a high-volume event until the returned callable is called.
+
+        The event is subscribed on the first request and dropped with the
+        last, so unwatched streams are not decoded at all.
+        """
+        if not self._stream_demand.get(event):
+            LOGGER.debug("Subscribing to %s from %s", event.target, self.name)
+            self._unsub_streams[event] = self.events.subscribe(
+                event, self._stream_handlers[event]
+            )
+        self._stream_demand[event] = self._stream_demand.get(event, 0) + 1
+
+        @callback
+        def release() -> None:
+            self._stream_demand[event] -= 1
+            if not self._stream_demand[event]:
+                LOGGER.debug("Dropping %s from %s", event.target, self.name)
+                self._unsub_streams.pop(event)()
+
+        return release
+
+    @callback
+    def async_subscribe_frames(
+        self, update_callback: Callable[[FrameSummary], None], interval: float
+    ) -> CALLBACK_TYPE:
+        """Receive frame summaries at most once per ``interval`` seconds."""
+        unsub_frames = self.frames.async_subscribe(update_callback, interval)
+        release = self.async_request_stream(EVENT_FRAMES)
+
+        @callback
+        def remove_listener() -> None:
+            unsub_frames()
+            release()
+
+        return remove_listener
+
+    @callback
+    def async_add_stats_listener(
+        self, update_callback: CALLBACK_TYPE, *, stream: bool = True
+    ) -> CALLBACK_TYPE:
+        """Listen for aggregated stats, published once per stats interval.
+
+        Listeners that pass ``stream=False`` only see the stats carried by
+        store pushes and do not keep the high-rate stats stream subscribed.
+        """
+        self._stats_listeners.append(update_callback)
+        if self._unsub_stats is None:
+            self._unsub_stats = async_track_time_interval(
+                self.hass, self._async_publish_stats, STATS_INTERVAL
+            )
+        release = self.async_request_stream(EVENT_STATS) if stream else None
+
+        @callback
+        def remove_listener() -> None:
+            self._stats_listeners.remove(update_callback)
+            if release is not None:
+                release()
+            if not self._stats_listeners and self._unsub_stats:
+                self._unsub_stats()
+                self._unsub_stats = None
+
+        return remove_listener
+
+    @callback
+    def _async_publish_stats(self, _now=None) -> None:
+        """Close the stats window and notify listeners if it had samples."""
+        if self.stats.flush():
+            for update_callback in list(self._stats_listeners):
+                update_callback()
+
+    @callback
+    def async_handle_mode(self, mode: int | None) -> None:
+        """Apply a ``mode`` push to the device state without network I/O."""
+        if self.data is None or mode is None:
+            self.hass.async_create_task(self.async_request_refresh())
+            return
+        self.data.device_mode = mode
+        self._async_confirm(self.data, ("device_mode",))
+        self.async_set_updated_data(self.data)
+
+    @callback
+    def async_start_socket(self) -> None:
+        """Keep the device socket open, polling whenever it is closed."""
+        self.supervisor.async_start()
+
+    @callback
+    def _async_socket_opened(self) -> None:
+        """Stop polling while the device pushes its state."""
+        self.update_interval = None
+        if self._push_gap:
+            # One fetch fills in whatever changed while the socket was closed.
+            self._push_gap = False
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_socket_closed(self) -> None:
+        """Resume polling and flag that pushes may have been missed."""
+        self._push_gap = True
+        self._async_adapt_interval(self.data)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_stagger_refresh(self) -> None:
+        """Shift this device's poll schedule by a random offset.
+
+        Devices set up together would otherwise poll in lock step, so the
+        next refresh is moved somewhere within one scan interval and every
+        later poll is scheduled relative to it.
+        """
+        if self.update_interval is None:
+            return
+
+        async def _refresh(_now) -> None:
+            self._unsub_stagger = None
+            await self.async_refresh()
+
+        offset = random.uniform(0, self.update_interval.total_seconds())
+        LOGGER.debug("Staggering %s polls by %.2fs", self.name, offset)
+        self._unsub_stagger = async_call_later(self.hass, offset, _refresh)
+
+    async def async_stop(self) -> None:
+        """Cancel pending work for this coordinator."""
+        if self._unsub_stagger:
+            self._unsub_stagger()
+            self._unsub_stagger = None
+        await self.commands.async_stop()
+        if self.udp is not None:
+            self.udp.close()
+        self.mirror.async_stop()
+        await self.renderer.async_stop()
+        # Closing the socket on unload must not schedule a resync refresh.
+        while self._unsub_socket:
+            self._unsub_socket.pop()()
+        await self.supervisor.async_stop()
+        async_release_session(self.hass, self.glimmr.host)
+
+
+def poll_interval(data: SystemData | None, boosted: bool = False) -> timedelta:
+    """Return how often to poll a device in a given state."""
+    if boosted:
+        return POLL_BOOST_INTERVAL
+    if data is None:
+        return SCAN_INTERVAL
+    if data.device_mode == 0 or data.auto_disabled:
+        return POLL_IDLE_INTERVAL
+    if data.device_mode in ACTIVE_MODES:
+        return POLL_ACTIVE_INTERVAL
+    return SCAN_INTERVAL
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a device value so optimistic and reported values compare equal."""
+    if isinstance(value, str):
+        return value.lower().lstrip("#")
+    return value
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key holding a config entry's snapshot."""
+    return f"{DOMAIN}.{entry_id}"
@@ -0,0 +1,41 @@
+"""Diagnostics support for Glimmr."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .client import async_connection_stats
+from .const import DOMAIN
+from .coordinator import GlimmrDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: GlimmrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "system_data": coordinator.data.to_dict() if coordinator.data else None,
+        "socket": coordinator.supervisor.diagnostics(),
+        "events": coordinator.events.diagnostics(),
+        "update_interval": (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None
+        ),
+        "commands": coordinator.commands.diagnostics(),
+        "confirm_latency": coordinator.confirm_latency,
+        "setup_time": coordinator.setup_time,
+        "connections": asdict(async_connection_stats(hass, coordinator.glimmr.host)),
+        "transport": {
+            "udp": coordinator.udp.diagnostics() if coordinator.udp else None,
+            "http_latency": coordinator.http_latency,
+        },
+        "renderer": coordinator.renderer.diagnostics(),
+        "preview": asdict(coordinator.preview),
+        "mirror": coordinator.mirror.diagnostics(),
+        "breaker": coordinator.breaker.diagnostics(),
+    }
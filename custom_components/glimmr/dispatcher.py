@@ -0,0 +1,102 @@
+"""Typed dispatch of Glimmr socket events to subscribers on any platform."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Generic, TypeVar
+
+from .const import LOGGER
+from .signalr import GlimmrSocket
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class GlimmrEvent(Generic[_T]):
+    """A hub method pushed by the device, carrying a payload of type ``_T``."""
+
+    target: str
+
+
+# The payload is the first argument of the hub invocation.
+EVENT_STORE: GlimmrEvent[dict[str, Any]] = GlimmrEvent("olo")
+EVENT_MODE: GlimmrEvent[int] = GlimmrEvent("mode")
+EVENT_FRAMES: GlimmrEvent[bytes | str | list[str]] = GlimmrEvent("frames")
+EVENT_STATS: GlimmrEvent[dict[str, Any]] = GlimmrEvent("stats")
+EVENT_LOG: GlimmrEvent[str] = GlimmrEvent("log")
+
+
+@dataclass
+class EventStats:
+    """Dispatch counters for one event type."""
+
+    dispatched: int = 0
+    handler_time: float = 0.0
+    max_handler_time: float = 0.0
+    errors: int = 0
+
+
+class GlimmrDispatcher:
+    """Fan socket events out to subscribers.
+
+    Each hub method is registered on the socket once, no matter how many
+    entities subscribe. Every subscriber receives the same payload object,
+    which must be treated as read-only.
+    """
+
+    def __init__(self, socket: GlimmrSocket) -> None:
+        """Initialize the dispatcher."""
+        self._socket = socket
+        self._subscribers: dict[GlimmrEvent, list[Callable[[Any], None]]] = {}
+        self._unsub_socket: dict[GlimmrEvent, Callable[[], None]] = {}
+        self.stats: dict[str, EventStats] = {}
+
+    def subscribe(
+        self, event: GlimmrEvent[_T], handler: Callable[[_T | None], None]
+    ) -> Callable[[], None]:
+        """Call ``handler`` with each payload of ``event``, returning an unsubscribe callable."""
+        subscribers = self._subscribers.setdefault(event, [])
+        subscribers.append(handler)
+        if event not in self._unsub_socket:
+            self._unsub_socket[event] = self._socket.on(
+                event.target, lambda arguments: self._dispatch(event, arguments)
+            )
+
+        def unsubscribe() -> None:
+            subscribers.remove(handler)
+            if not subscribers and (unsub := self._unsub_socket.pop(event, None)):
+                unsub()
+
+        return unsubscribe
+
+    def _dispatch(self, event: GlimmrEvent, arguments: list[Any]) -> None:
+        """Deliver one invocation to every subscriber of its event."""
+        payload = arguments[0] if arguments else None
+        if (stats := self.stats.get(event.target)) is None:
+            stats = self.stats[event.target] = EventStats()
+        stats.dispatched += 1
+        for handler in list(self._subscribers.get(event, ())):
+            started = perf_counter()
+            try:
+                handler(payload)
+            except Exception:  # pylint: disable=broad-except
+                stats.errors += 1
+                LOGGER.exception("Error handling %s from %s", event.target, self._socket.host)
+            elapsed = perf_counter() - started
+            stats.handler_time += elapsed
+            stats.max_handler_time = max(stats.max_handler_time, elapsed)
+
+    def diagnostics(self) -> dict[str, dict[str, Any]]:
+        """Return per-event dispatch counts and handler latency."""
+        return {
+            target: {
+                "dispatched": stats.dispatched,
+                "errors": stats.errors,
+                "mean_handler_time": stats.handler_time / stats.dispatched
+                if stats.dispatched
+                else None,
+                "max_handler_time": stats.max_handler_time,
+            }
+            for target, stats in self.stats.items()
+        }
@@ -0,0 +1,23 @@
+"""Base entity for Glimmr."""
+from __future__ import annotations
+
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import GlimmrDataUpdateCoordinator
+
+
+class GlimmrEntity(CoordinatorEntity[GlimmrDataUpdateCoordinator]):
+    """Defines a base Glimmr entity."""
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Get device specific attributes."""
+        name = self.coordinator.glimmr.system_data.device_name
+        return {
+            "identifiers": {(DOMAIN, name)},
+            "name": name,
+            "manufacturer": "D8ahazard",
+            "model": "Glimmr",
+        }
@@ -0,0 +1,270 @@
+"""Sector frame ingestion for Glimmr."""
+from __future__ import annotations
+
+import asyncio
+import binascii
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from glimmr import SystemData
+import numpy as np
+
+from .const import FRAME_BUFFER_SIZE, LOGGER
+
+EDGES = ("right", "top", "left", "bottom")
+
+# Colors are quantized to this many bits per channel to find the dominant color.
+DOMINANT_BITS = 4
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    """LED and sector layout of a Glimmr device.
+
+    Frames run counter-clockwise from the bottom right corner: up the right
+    edge, across the top, down the left edge and back along the bottom.
+    """
+
+    right: int
+    top: int
+    left: int
+    bottom: int
+    h_sectors: int
+    v_sectors: int
+
+    @classmethod
+    def from_system_data(cls, data: SystemData) -> FrameLayout:
+        """Read the layout from a device's system data."""
+        return cls(
+            right=_count(data.right_count),
+            top=_count(data.top_count),
+            left=_count(data.left_count),
+            bottom=_count(data.bottom_count),
+            h_sectors=_count(data.h_sectors),
+            v_sectors=_count(data.v_sectors),
+        )
+
+    @property
+    def led_count(self) -> int:
+        """Return the number of LEDs around the screen."""
+        return self.right + self.top + self.left + self.bottom
+
+    @property
+    def sector_count(self) -> int:
+        """Return the number of perimeter sectors, sharing corners between edges."""
+        if self.h_sectors < 2 or self.v_sectors < 2:
+            return 0
+        return 2 * self.h_sectors + 2 * self.v_sectors - 4
+
+    def edge_indices(self, length: int) -> dict[str, np.ndarray]:
+        """Return the frame indices belonging to each edge for a frame length."""
+        if length == self.led_count and length:
+            bounds = np.cumsum([0, self.right, self.top, self.left, self.bottom])
+            return {
+                edge: np.arange(bounds[i], bounds[i + 1])
+                for i, edge in enumerate(EDGES)
+            }
+        if length == self.sector_count and length:
+            h_sec, v_sec = self.h_sectors, self.v_sectors
+            top = v_sec - 1
+            left = top + h_sec - 1
+            bottom = left + v_sec - 1
+            return {
+                "right": np.arange(0, v_sec),
+                "top": np.arange(top, top + h_sec),
+                "left": np.arange(left, left + v_sec),
+                "bottom": np.append(np.arange(bottom, length), 0),
+            }
+        return {}
+
+
+@dataclass(frozen=True)
+class FrameSummary:
+    """Colors derived from a single frame."""
+
+    seq: int
+    timestamp: float
+    average: tuple[int, int, int]
+    dominant: tuple[int, int, int]
+    edges: dict[str, tuple[int, int, int]]
+
+
+@dataclass
+class PreviewStats:
+    """Counters of the frame preview cache."""
+
+    frame_seq: int | None = None
+    encodes: int = 0
+    cache_hits: int = 0
+
+
+class _Subscriber:
+    """A throttled frame summary listener."""
+
+    __slots__ = ("callback", "interval", "last")
+
+    def __init__(self, callback: Callable[[FrameSummary], None], interval: float) -> None:
+        self.callback = callback
+        self.interval = interval
+        self.last = float("-inf")
+
+
+class FrameStream:
+    """Decode pushed frames into a preallocated ring buffer.
+
+    Each frame is copied into the next slot of a fixed ``(size, pixels, 3)``
+    uint8 array, so ingesting a frame allocates no per-pixel Python objects.
+    Summaries are only computed when a subscriber is due for one.
+    """
+
+    def __init__(self, layout: FrameLayout, size: int = FRAME_BUFFER_SIZE) -> None:
+        """Initialize the frame stream."""
+        self.seq = 0
+        self.timestamp: float | None = None
+        self._size = size
+        self._subscribers: list[_Subscriber] = []
+        self._waiters: list[asyncio.Future] = []
+        self.layout = layout
+        self._allocate(max(layout.led_count, layout.sector_count, 1))
+
+    def _allocate(self, pixels: int) -> None:
+        """(Re)allocate the ring buffer for frames of up to ``pixels`` colors."""
+        self._ring = np.zeros((self._size, pixels, 3), dtype=np.uint8)
+        self._lengths = np.zeros(self._size, dtype=np.intp)
+        self._edges: dict[int, dict[str, np.ndarray]] = {}
+
+    def async_set_layout(self, layout: FrameLayout) -> None:
+        """Adopt a new device layout, resizing the buffer if needed."""
+        if layout == self.layout:
+            return
+        self.layout = layout
+        pixels = max(layout.led_count, layout.sector_count, 1)
+        if pixels > self._ring.shape[1]:
+            self._allocate(pixels)
+        self._edges.clear()
+
+    @property
+    def latest(self) -> np.ndarray | None:
+        """Return a read-only view of the most recent frame."""
+        if not self.seq:
+            return None
+        slot = (self.seq - 1) % self._size
+        view = self._ring[slot, : self._lengths[slot]]
+        view.flags.writeable = False
+        return view
+
+    def history(self) -> np.ndarray:
+        """Return a copy of the buffered frames, oldest first, cropped to the latest length."""
+        count = min(self.seq, self._size)
+        if not count:
+            return np.empty((0, 0, 3), dtype=np.uint8)
+        length = self._lengths[(self.seq - 1) % self._size]
+        slots = (np.arange(self.seq - count, self.seq)) % self._size
+        return self._ring[slots, :length]
+
+    def async_subscribe(
+        self, callback: Callable[[FrameSummary], None], interval: float
+    ) -> Callable[[], None]:
+        """Call ``callback`` with a frame summary at most once per ``interval`` seconds."""
+        subscriber = _Subscriber(callback, interval)
+        self._subscribers.append(subscriber)
+        return lambda: self._subscribers.remove(subscriber)
+
+    async def async_wait_frame(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the next frame, returning if one arrived."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return True
+
+    def async_handle_frame(self, payload: bytes | str | list[str] | None) -> None:
+        """Ingest a ``frames`` push."""
+        if payload is None:
+            return
+        try:
+            raw = _frame_bytes(payload)
+        except (TypeError, ValueError, binascii.Error) as err:
+            LOGGER.debug("Ignoring undecodable frame: %s", err)
+            return
+
+        pixels = len(raw) // 3
+        if pixels > self._ring.shape[1]:
+            self._allocate(pixels)
+        slot = self.seq % self._size
+        flat = self._ring[slot].reshape(-1)
+        flat[: pixels * 3] = np.frombuffer(raw, dtype=np.uint8, count=pixels * 3)
+        self._lengths[slot] = pixels
+        self.seq += 1
+        self.timestamp = now = monotonic()
+        if self._waiters:
+            for waiter in self._waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+            self._waiters.clear()
+
+        due = [sub for sub in self._subscribers if now - sub.last >= sub.interval]
+        if not due:
+            return
+        summary = self.summarize()
+        for subscriber in due:
+            subscriber.last = now
+            subscriber.callback(summary)
+
+    def summarize(self) -> FrameSummary | None:
+        """Compute average, dominant and per-edge colors of the latest frame."""
+        frame = self.latest
+        if frame is None or not len(frame):
+            return None
+        edges = self._edges.get(len(frame))
+        if edges is None:
+            edges = self._edges[len(frame)] = self.layout.edge_indices(len(frame))
+        return FrameSummary(
+            seq=self.seq,
+            timestamp=self.timestamp,
+            average=_rgb(frame.mean(axis=0)),
+            dominant=dominant_color(frame),
+            edges={edge: _rgb(frame[idx].mean(axis=0)) for edge, idx in edges.items()},
+        )
+
+
+def dominant_color(frame: np.ndarray) -> tuple[int, int, int]:
+    """Return the mean color of the most populated quantized color bin."""
+    shift = 8 - DOMINANT_BITS
+    quant = (frame >> shift).astype(np.uint16)
+    codes = (quant[:, 0] << (2 * DOMINANT_BITS)) | (quant[:, 1] << DOMINANT_BITS) | quant[:, 2]
+    winner = np.bincount(codes).argmax()
+    return _rgb(frame[codes == winner].mean(axis=0))
+
+
+def _frame_bytes(payload: Any) -> bytes:
+    """Return packed RGB bytes from a frame payload.
+
+    Glimmr serializes byte arrays as base64 strings over JSON and as binary
+    over MessagePack; lists of hex colors are accepted as well.
+    """
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return binascii.a2b_base64(payload)
+    if isinstance(payload, list):
+        return bytes.fromhex("".join(payload))
+    raise TypeError(f"Unsupported frame payload {type(payload).__name__}")
+
+
+def _rgb(color: np.ndarray) -> tuple[int, int, int]:
+    """Round a float color to an RGB tuple."""
+    red, green, blue = np.rint(color).astype(int).tolist()
+    return red, green, blue
+
+
+def _count(value: Any) -> int:
+    """Return a layout count, treating unknown values as zero."""
+    return value if isinstance(value, int) and value > 0 else 0
@@ -0,0 +1,66 @@
+"""Concurrent fan-out of commands to a group of Glimmr devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from time import monotonic
+
+from .const import GROUP_MEMBER_TIMEOUT, LOGGER
+from .coordinator import GlimmrDataUpdateCoordinator
+
+
+@dataclass(frozen=True)
+class FanOutResult:
+    """Outcome of one command sent to every member of a group."""
+
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    # Seconds between the first and the last member acknowledging the command
+    spread: float | None = None
+
+
+async def async_fan_out(
+    members: Mapping[str, GlimmrDataUpdateCoordinator],
+    call: Callable[[GlimmrDataUpdateCoordinator], Awaitable[None]],
+    timeout: float = GROUP_MEMBER_TIMEOUT,
+) -> FanOutResult:
+    """Run ``call`` for every member at once, each bounded by ``timeout``.
+
+    A slow or failing member never holds up or fails the others; its error is
+    reported in the result instead. Only cancellation is raised.
+    """
+
+    async def _async_member(coordinator: GlimmrDataUpdateCoordinator) -> float:
+        await asyncio.wait_for(call(coordinator), timeout)
+        return monotonic()
+
+    names = list(members)
+    outcomes = await asyncio.gather(
+        *(_async_member(members[name]) for name in names), return_exceptions=True
+    )
+
+    acknowledged: dict[str, float] = {}
+    failed: dict[str, str] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            failed[name] = "timeout"
+        elif isinstance(outcome, Exception):
+            failed[name] = str(outcome) or type(outcome).__name__
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            acknowledged[name] = outcome
+
+    spread = None
+    if acknowledged:
+        spread = max(acknowledged.values()) - min(acknowledged.values())
+    if failed:
+        LOGGER.warning("Glimmr group command failed for %s", failed)
+    LOGGER.debug(
+        "Glimmr group command reached %s of %s members, spread %s",
+        len(acknowledged),
+        len(names),
+        spread,
+    )
+    return FanOutResult(succeeded=list(acknowledged), failed=failed, spread=spread)
@@ -1,12 +1,11 @@
 """Glimmr integration."""
 from __future__ import annotations
 
-from typing import List, Any, Tuple, Set
+from typing import Any, Tuple, Set
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from glimmr import Glimmr
-from glimmr.exceptions import GlimmrConnectionError, GlimmrError
 # Import the device class from the component
 from homeassistant.components.light import (
     ATTR_EFFECT,
@@ -17,9 +16,41 @@ from homeassistant.components.light import (
     LightEntity,
 )
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_MAC
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.util import slugify
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_GROUPS,
+    CONF_MEMBERS,
+    DOMAIN,
+    LOGGER,
+    MIRROR_MAX_RATE,
+    MIRROR_RATE,
+    MIRROR_THRESHOLD,
+    SERVICE_MIRROR,
+    SERVICE_STOP_MIRROR,
+    SERVICE_STREAM,
+    SIGNAL_COORDINATOR_ADDED,
+    STREAM_FPS,
+    STREAM_MAX_FPS,
+)
+from .coordinator import GlimmrDataUpdateCoordinator
+from .entity import GlimmrEntity
+from .group import FanOutResult, async_fan_out
+from .mirror import JUST_NOTICEABLE_DIFFERENCE, ZONES
+from .models import STATE_FIELDS, GlimmrState
+from .renderer import EFFECTS, solid
+from .scenes import SceneCatalog
+
+ATTR_FPS = "fps"
+ATTR_MAX_RATE = "max_rate"
+ATTR_SOURCE_ENTITY = "source_entity"
+ATTR_TARGETS = "targets"
+ATTR_THRESHOLD = "threshold"
+ATTR_ZONE = "zone"
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {vol.Required(CONF_HOST): cv.string,
@@ -30,110 +61,106 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the Glimmr platform from legacy config."""
+    if discovery_info is not None:
+        async_add_entities(
+            GlimmrGroupLight(group[CONF_NAME], group[CONF_MEMBERS])
+            for group in discovery_info[CONF_GROUPS]
+        )
+        return True
+
     # Assign configuration variables.
     # The configuration check takes care they are present.
     ip_address = config[CONF_HOST]
-    try:
-        bulb = Glimmr(ip_address)
-        # Add devices
-        LOGGER.debug("Creating light %s", ip_address)
-        async_add_entities([GlimmrLight(bulb)], update_before_add=True)
-        return True
-    except GlimmrConnectionError:
+    coordinator = GlimmrDataUpdateCoordinator(hass, host=ip_address)
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
         LOGGER.error("Can't add device with ip %s.", ip_address)
+        await coordinator.async_stop()
         return False
 
+    # Add devices
+    LOGGER.debug("Creating light %s", ip_address)
+    async_add_entities([GlimmrLight(coordinator)])
+    coordinator.async_start_socket()
+    coordinator.async_stagger_refresh()
+    return True
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the Glimmr platform from config_flow."""
     # Assign configuration variables.
-    light = hass.data[DOMAIN][entry.unique_id]
-    LOGGER.debug("Setting up glimmr: ")
-    glimmr_light = GlimmrLight(light)
-    LOGGER.debug("ASE", glimmr_light)
-    # Add devices with defined name
-    async_add_entities([glimmr_light], update_before_add=True)
+    coordinator: GlimmrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    LOGGER.debug("Setting up glimmr: %s", entry.data.get(CONF_HOST))
+    glimmr_light = GlimmrLight(coordinator)
+    # Add devices with defined name; the coordinator already holds fresh data.
+    async_add_entities([glimmr_light])
 
     # Register services
     async def async_update(call=None):
         """Trigger update."""
         LOGGER.debug("[glimmr light %s] update requested", entry.data.get(CONF_HOST))
-        await glimmr_light.async_update()
-        await glimmr_light.async_update_ha_state()
+        await coordinator.async_refresh()
 
     service_name = slugify(f"{entry.data.get(CONF_NAME)} updateService")
     hass.services.async_register(DOMAIN, service_name, async_update)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_STREAM,
+        {
+            vol.Optional(ATTR_EFFECT): vol.In(list(EFFECTS)),
+            vol.Optional(ATTR_SOURCE_ENTITY): cv.entity_id,
+            vol.Optional(ATTR_FPS, default=STREAM_FPS): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=STREAM_MAX_FPS)
+            ),
+        },
+        "async_stream",
+    )
+    platform.async_register_entity_service(
+        SERVICE_MIRROR,
+        {
+            vol.Required(ATTR_TARGETS): cv.entity_ids,
+            vol.Optional(ATTR_ZONE, default="screen"): vol.In(ZONES),
+            vol.Optional(ATTR_MAX_RATE, default=MIRROR_RATE): vol.All(
+                vol.Coerce(float), vol.Range(min=0.1, max=MIRROR_MAX_RATE)
+            ),
+            vol.Optional(ATTR_THRESHOLD, default=MIRROR_THRESHOLD): vol.All(
+                vol.Coerce(float), vol.Range(min=JUST_NOTICEABLE_DIFFERENCE, max=100)
+            ),
+        },
+        "async_mirror",
+    )
+    platform.async_register_entity_service(
+        SERVICE_STOP_MIRROR,
+        {vol.Optional(ATTR_TARGETS): cv.entity_ids},
+        "async_stop_mirror",
+    )
     return True
 
 
-class GlimmrLight(LightEntity):
+class GlimmrLight(GlimmrEntity, LightEntity):
     _attr_icon = "mdi:led-strip-variant"
     """Representation of Glimmr device."""
 
-    def __init__(self, glimmr: Glimmr):
+    # Snapshot fields that affect the state this entity exposes
+    _watched_fields = frozenset({"mode", "auto_disabled", "ambient_color", "ambient_scene"})
+
+    def __init__(self, coordinator: GlimmrDataUpdateCoordinator):
         """Initialize an Glimmr."""
         LOGGER.debug("Initializing light...")
-        self.glimmr: Glimmr = glimmr
-        self.glimmr.LOGGER = LOGGER
-        self.glimmr.system_data = glimmr.system_data
-        self._state = self.glimmr.system_data.device_mode
-        if self.glimmr.system_data.auto_disabled:
-            self._state = 0
+        super().__init__(coordinator)
+        self.glimmr: Glimmr = coordinator.glimmr
         self._brightness = 255
         self._name = self.glimmr.system_data.device_name
-        self.rgb_color = bytes.fromhex(self.glimmr.system_data.ambient_color)
         self._available = None
-        self._effect = self.glimmr.system_data.ambient_scene
-        self._scenes: List[str] = []
-        self.update_scene_list()
-
-    async def async_added_to_hass(self):
-        """Register device notification."""
-        LOGGER.debug("Added, connecting to ws.")
-        await self.async_initialize_device()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self.glimmr.connected:
-            LOGGER.debug("Disconnecting from ws.")
-            self.glimmr.socket.stop()
-
-    def turn_off(self, **kwargs: Any) -> None:
-        self.glimmr.set_mode(0)
-
-    def turn_on(self, **kwargs: Any) -> None:
-        """Instruct the light to turn on."""
-        if ATTR_RGB_COLOR in kwargs:
-            self.glimmr.set_ambient_color(kwargs.get(ATTR_RGB_COLOR))
-            return
-
-        if ATTR_EFFECT in kwargs:
-            scene_id = self.glimmr.get_scene_id_from_name(kwargs[ATTR_EFFECT])
-
-            if scene_id < -1:  # rhythm
-                mode = 0
-                if scene_id == -2:
-                    mode = 1
-                if scene_id == -3:
-                    mode = 2
-                if scene_id == -4:
-                    mode = 3
-                if scene_id == -5:
-                    mode = 4
-                if scene_id == -6:
-                    mode = 5
-                if scene_id == -7:
-                    mode = 6
-                LOGGER.debug("Setting mode to %s", mode)
-                self.glimmr.set_mode(mode)
-                return
-            else:
-                LOGGER.debug("Setting ambient scene: %s", scene_id)
-                self.glimmr.system_data.ambient_scene = scene_id
-                self.glimmr.set_ambient_scene(scene_id)
-                return
-
-        else:
-            self.glimmr.set_mode(self.glimmr.system_data.previous_mode)
+        self._state = 0
+        self._rgb_color = None
+        self._effect = None
+        self._written: GlimmrState | None = None
+        self._written_available: bool | None = None
+        self._written_scenes: SceneCatalog | None = None
+        self._written_stream: str | None = None
+        self.update_state()
 
     @property
     def brightness(self):
@@ -147,8 +174,6 @@ class GlimmrLight(LightEntity):
     @property
     def rgb_color(self) -> Tuple[int, int, int]:
         """Return the ambient color property."""
-        LOGGER.debug("RGBCOL")
-        LOGGER.debug("Color: %s", self._rgb_color)
         return self._rgb_color
 
     @property
@@ -168,53 +193,11 @@ class GlimmrLight(LightEntity):
 
     async def async_turn_on(self, **kwargs):
         """Instruct the light to turn on."""
-
-        if ATTR_RGB_COLOR in kwargs:
-            rgb = kwargs[ATTR_RGB_COLOR]
-            color = '#%02x%02x%02x' % rgb
-            LOGGER.debug("Setting ambient color to " + color)
-            await self.glimmr.set_ambient_color(color)
-            return
-
-        if ATTR_EFFECT in kwargs:
-            scene_id = kwargs[ATTR_EFFECT]
-            s_id = self.glimmr.get_scene_id_from_name(scene_id)
-            if s_id < -1:
-                mode = self.glimmr.system_data.previous_mode
-                if s_id == -2:
-                    mode = 1
-                if s_id == -3:
-                    mode = 2
-                if s_id == -4:
-                    mode = 3
-                if s_id == -5:
-                    mode = 4
-                if s_id == -6:
-                    mode = 5
-                if s_id == -7:
-                    mode = 6
-                await self.glimmr.set_mode(mode)
-                return
-            else:
-                LOGGER.debug(
-                    "[glimmrlight %s] Setting ambient scene: %s",
-                    self.glimmr.system_data.device_name,
-                    s_id
-                )
-                await self.glimmr.set_ambient_scene(s_id)
-
-        else:
-            LOGGER.debug("Setting mode to %s", self.glimmr.system_data.previous_mode)
-            await self.glimmr.set_mode(self.glimmr.system_data.previous_mode)
+        await async_turn_on_device(self.coordinator, **kwargs)
 
     async def async_turn_off(self, **kwargs):
         """Instruct the light to turn off."""
-        await self.glimmr.set_mode(0)
-
-    @property
-    def should_poll(self) -> bool:
-        """Update the state periodically."""
-        return self.glimmr.connected is False
+        await self.coordinator.async_set_mode(0)
 
     @property
     def supported_color_modes(self) -> Set[str]:
@@ -223,7 +206,6 @@ class GlimmrLight(LightEntity):
     @property
     def effect(self):
         """Return the current effect."""
-        LOGGER.debug("Cur effect requested: %s", self._effect)
         return self._effect
 
     @property
@@ -232,35 +214,32 @@ class GlimmrLight(LightEntity):
 
         URL: https://docs.pro.glimmrconnected.com/#light-modes
         """
-        return self._scenes
+        return [*self.coordinator.scenes.names, *EFFECTS]
 
     @property
     def available(self):
         """Return if light is available."""
-        return self._available
-
-    async def async_update(self, force=False):
-        """Fetch new state data for this light."""
-        LOGGER.debug("Forcing state update.")
-        await self.update_state(force)
-
-        if self._state is not None and self._state is not False and force is True:
-            LOGGER.debug("Updating scene list.")
-            await self.update_scene_list()
-
-    @property
-    def device_info(self):
-        """Get device specific attributes."""
-        LOGGER.debug(
-            "[glimmrlight %s] Call device info...",
-            self._name
-        )
-        return {
-            "identifiers": {(DOMAIN, self._name)},
-            "name": self._name,
-            "manufacturer": "D8ahazard",
-            "model": "Glimmr",
-        }
+        return super().available and self._available is not False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when a field this entity exposes has changed."""
+        coordinator = self.coordinator
+        snapshot = coordinator.state
+        changed = snapshot.diff(self._written) if snapshot else STATE_FIELDS
+        if (
+            self._watched_fields.isdisjoint(changed)
+            and coordinator.last_update_success == self._written_available
+            and coordinator.scenes is self._written_scenes
+            and coordinator.renderer.effect_name == self._written_stream
+        ):
+            return
+        self._written = snapshot
+        self._written_available = coordinator.last_update_success
+        self._written_scenes = coordinator.scenes
+        self._written_stream = coordinator.renderer.effect_name
+        self.update_state()
+        super()._handle_coordinator_update()
 
     @property
     def color_mode(self) -> str:
@@ -278,21 +257,14 @@ class GlimmrLight(LightEntity):
         self._state = 0
         self._available = False
 
-    async def update_state(self, pull: bool):
-        """Update the state."""
-        try:
-            if pull:
-                await self.glimmr.update()
+    def update_state(self):
+        """Update the state from the coordinator's latest data."""
+        if self.coordinator.last_update_success:
             self.update_state_available()
             self.update_color()
             self.update_effect()
             self.update_mode()
-            await self.update_scene_list()
-        except TimeoutError as ex:
-            LOGGER.debug(ex)
-            self.update_state_unavailable()
-        except GlimmrError as ex:
-            LOGGER.debug(ex)
+        else:
             self.update_state_unavailable()
         LOGGER.debug(
             "[glimmrlight %s] updated state, avail, scene: %s, %s, %s",
@@ -302,12 +274,50 @@ class GlimmrLight(LightEntity):
             self._effect
         )
 
+    async def async_stream(
+        self,
+        effect: str | None = None,
+        source_entity: str | None = None,
+        fps: float = STREAM_FPS,
+    ) -> None:
+        """Stream an integration-rendered effect or another light's color."""
+        if source_entity is not None:
+
+            def _source_color() -> Tuple[int, int, int] | None:
+                if (state := self.hass.states.get(source_entity)) is None:
+                    return None
+                return state.attributes.get(ATTR_RGB_COLOR)
+
+            await self.coordinator.async_stream_effect(
+                f"Follow {source_entity}", solid(_source_color), fps
+            )
+        elif effect is not None:
+            await self.coordinator.async_stream_effect(effect, EFFECTS[effect], fps)
+        else:
+            raise HomeAssistantError("Either an effect or a source entity is required")
+
+    async def async_mirror(
+        self,
+        targets: list[str],
+        zone: str = "screen",
+        max_rate: float = MIRROR_RATE,
+        threshold: float = MIRROR_THRESHOLD,
+    ) -> None:
+        """Make other lights follow a zone of the captured screen."""
+        if self.entity_id in targets:
+            raise HomeAssistantError("A Glimmr cannot mirror itself")
+        self.coordinator.mirror.async_start(targets, zone, max_rate, threshold)
+
+    async def async_stop_mirror(self, targets: list[str] | None = None) -> None:
+        """Stop lights following the screen, or all of them."""
+        self.coordinator.mirror.async_stop(targets)
+
     async def async_effect(
             self,
             effect: int | None = None
     ) -> None:
         """Set the effect of a Glimmr light."""
-        await self.glimmr.set_ambient_scene(effect)
+        await self.coordinator.async_set_ambient_scene(effect)
 
     def update_color(self):
         """Update the hs color."""
@@ -321,29 +331,13 @@ class GlimmrLight(LightEntity):
 
     def update_effect(self):
         """Update the bulb scene."""
-        mode = self.glimmr.system_data.device_mode
-        effect = 0
-        if mode == 0:
-            effect = self.glimmr.system_data.ambient_scene
-        if mode == 1:
-            effect = -2
-        if mode == 2:
-            effect = -3
-        if mode == 3:
-            effect = self.glimmr.system_data.ambient_scene
-        if mode == 4:
-            effect = -5
-        if mode == 5:
-            effect = -6
-        LOGGER.debug("Effect id set to: %s", effect)
-        self._effect = self.glimmr.get_scene_name_from_id(effect)
-
-    async def update_scene_list(self):
-        """Update the scene list."""
-        LOGGER.debug("Updating scene list...")
-        _value = self.glimmr.ambient_scenes
-        self._scenes = list(_value.keys())
-        LOGGER.debug("Updating scene list: %s", self._scenes)
+        system_data = self.glimmr.system_data
+        self._effect = self.coordinator.renderer.effect_name
+        if self._effect is None:
+            self._effect = self.coordinator.scenes.effect_name(
+                system_data.device_mode, system_data.ambient_scene
+            )
+        LOGGER.debug("Effect set to: %s", self._effect)
 
     def update_mode(self):
         pass
@@ -352,40 +346,200 @@ class GlimmrLight(LightEntity):
     def rgb_color(self, value):
         self._rgb_color = value
 
-    def update_data(self, data):
-        LOGGER.debug("Updating from ws!")
-        self.update_state(False)
-        super().schedule_update_ha_state(True)
-
-    async def async_initialize_device(self):
-        LOGGER.debug("Starting socket.")
-        await self.hass.async_add_executor_job(self.glimmr.socket.start)
-        self.glimmr.socket.on("olo", self.update_data)
-        self.glimmr.socket.on("mode", self.mode_changed)
-        self.glimmr.socket.on("stats", self.stats)
-        self.glimmr.socket.on("log", self.log)
-        self.glimmr.socket.on("frames", self.frames)
-        self.glimmr.socket.on_open(self.connected)
-        self.glimmr.socket.on_close(self.closed)
-
-    def mode_changed(self, mode):
-        LOGGER.debug("Modechange...")
-        LOGGER.debug("Updating mode from ws: %s", mode[0])
-        self.glimmr.system_data.device_mode = mode[0]
-        super().schedule_update_ha_state(True)
-
-    def stats(self, stats):
-        LOGGER.debug("Oooh, stats: ", stats)
-        pass
 
-    def log(self, msg):
-        pass
+def _parse_hex_color(value: Any) -> Tuple[int, int, int] | None:
+    """Return an RGB tuple for a hex color, or None for missing or unknown colors."""
+    if not isinstance(value, str):
+        return None
+    hex_color = value.lstrip("#")
+    if len(hex_color) != 6:
+        return None
+    try:
+        return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        return None
+
+
+async def async_turn_on_device(
+    coordinator: GlimmrDataUpdateCoordinator, **kwargs: Any
+) -> None:
+    """Apply a light turn on call to one Glimmr device."""
+    system_data = coordinator.glimmr.system_data
+
+    if ATTR_RGB_COLOR in kwargs:
+        rgb = kwargs[ATTR_RGB_COLOR]
+        color = '#%02x%02x%02x' % rgb
+        LOGGER.debug("Setting ambient color to " + color)
+        await coordinator.async_set_ambient_color(color)
+        return
+
+    if kwargs.get(ATTR_EFFECT) in EFFECTS:
+        name = kwargs[ATTR_EFFECT]
+        await coordinator.async_stream_effect(name, EFFECTS[name])
+        return
+
+    if ATTR_EFFECT in kwargs:
+        scenes = coordinator.scenes
+        s_id = scenes.scene_id(kwargs[ATTR_EFFECT])
+        if s_id is None:
+            LOGGER.warning("Unknown Glimmr effect: %s", kwargs[ATTR_EFFECT])
+            return
+        if s_id < -1:
+            mode = scenes.mode_for(s_id)
+            if mode is None:
+                mode = system_data.previous_mode
+            await coordinator.async_set_mode(mode)
+            return
+        else:
+            LOGGER.debug(
+                "[glimmrlight %s] Setting ambient scene: %s",
+                system_data.device_name,
+                s_id
+            )
+            await coordinator.async_set_ambient_scene(s_id)
 
-    def frames(self, frames):
-        pass
+    else:
+        LOGGER.debug("Setting mode to %s", system_data.previous_mode)
+        await coordinator.async_set_mode(system_data.previous_mode)
 
-    def connected(self):
-        pass
 
-    def closed(self):
-        pass
+class GlimmrGroupLight(LightEntity):
+    """A group of Glimmr devices commanded concurrently."""
+
+    _attr_icon = "mdi:led-strip-variant"
+    _attr_should_poll = False
+
+    def __init__(self, name: str, members: list[str]) -> None:
+        """Initialize a Glimmr group of device ids or hosts."""
+        self._attr_name = name
+        self._attr_unique_id = f"group_{slugify(name)}"
+        self._member_ids = set(members)
+        self._tracked: set[int] = set()
+        self._last_result: FanOutResult | None = None
+
+    def _is_member(self, coordinator: GlimmrDataUpdateCoordinator) -> bool:
+        """Return if a coordinator's device belongs to this group."""
+        glimmr = coordinator.glimmr
+        return bool(
+            {glimmr.host, getattr(glimmr.system_data, "device_id", None)}
+            & self._member_ids
+        )
+
+    @property
+    def members(self) -> dict[str, GlimmrDataUpdateCoordinator]:
+        """Return the group's set up devices by name."""
+        return {
+            coordinator.glimmr.system_data.device_name or coordinator.glimmr.host: coordinator
+            for coordinator in self.hass.data.get(DOMAIN, {}).values()
+            if isinstance(coordinator, GlimmrDataUpdateCoordinator)
+            and self._is_member(coordinator)
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the state of every member, including ones set up later."""
+        for coordinator in self.members.values():
+            self._async_track(coordinator)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_COORDINATOR_ADDED, self._async_coordinator_added
+            )
+        )
+
+    @callback
+    def _async_coordinator_added(self, coordinator: GlimmrDataUpdateCoordinator) -> None:
+        """Start following a device that was set up after the group."""
+        if self._is_member(coordinator):
+            self._async_track(coordinator)
+            self.async_write_ha_state()
+
+    @callback
+    def _async_track(self, coordinator: GlimmrDataUpdateCoordinator) -> None:
+        """Write the group state whenever a member updates."""
+        if id(coordinator) in self._tracked:
+            return
+        self._tracked.add(id(coordinator))
+        self.async_on_remove(coordinator.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        """Return if any member is available."""
+        return any(c.last_update_success for c in self.members.values())
+
+    @property
+    def is_on(self) -> bool:
+        """Return if any member is on."""
+        return any(
+            c.state is not None and c.state.mode != 0 and not c.state.auto_disabled
+            for c in self.members.values()
+        )
+
+    @property
+    def supported_features(self) -> int:
+        return SUPPORT_EFFECT
+
+    @property
+    def supported_color_modes(self) -> Set[str]:
+        return {COLOR_MODE_RGB}
+
+    @property
+    def color_mode(self) -> str:
+        return COLOR_MODE_RGB
+
+    @property
+    def rgb_color(self) -> Tuple[int, int, int] | None:
+        """Return the ambient color of the first member reporting a valid one."""
+        for coordinator in self.members.values():
+            if coordinator.state is not None and (
+                rgb := _parse_hex_color(coordinator.state.ambient_color)
+            ):
+                return rgb
+        return None
+
+    @property
+    def effect(self) -> str | None:
+        """Return the effect when every member runs the same one."""
+        effects = {
+            c.scenes.effect_name(c.state.mode, c.state.ambient_scene)
+            for c in self.members.values()
+            if c.state is not None
+        }
+        return effects.pop() if len(effects) == 1 else None
+
+    @property
+    def effect_list(self) -> list[str]:
+        """Return the effects of every member."""
+        names: dict[str, None] = {}
+        for coordinator in self.members.values():
+            names.update(dict.fromkeys(coordinator.scenes.names))
+        return [*names, *EFFECTS]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the members and the outcome of the last group command."""
+        attributes: dict[str, Any] = {"members": list(self.members)}
+        if (result := self._last_result) is not None:
+            attributes["failed_members"] = result.failed
+            if result.spread is not None:
+                attributes["spread_ms"] = round(result.spread * 1000, 1)
+        return attributes
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn every member on at once."""
+        await self._async_fan_out(
+            lambda coordinator: async_turn_on_device(coordinator, **kwargs)
+        )
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn every member off at once."""
+        await self._async_fan_out(lambda coordinator: coordinator.async_set_mode(0))
+
+    async def _async_fan_out(self, call) -> None:
+        """Send a command to all members, failing only if none accepted it."""
+        if not (members := self.members):
+            raise HomeAssistantError(f"No members of {self.name} are set up")
+        self._last_result = result = await async_fan_out(members, call)
+        self.async_write_ha_state()
+        if not result.succeeded:
+            raise HomeAssistantError(
+                f"All members of {self.name} failed: {result.failed}"
+            )
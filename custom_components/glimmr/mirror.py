@@ -0,0 +1,300 @@
+"""Mirror Glimmr's captured screen colors to other lights."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import math
+from time import monotonic
+from typing import Any
+
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_RGB_COLOR,
+    DOMAIN as LIGHT_DOMAIN,
+)
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_ON
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+import numpy as np
+
+from .const import (
+    LATENCY_SAMPLES,
+    LOGGER,
+    MIRROR_RATE,
+    MIRROR_RATE_WINDOW,
+    MIRROR_SAMPLE_INTERVAL,
+    MIRROR_SMOOTHING,
+    MIRROR_THRESHOLD,
+)
+from .frames import DOMINANT_BITS, EDGES, FrameLayout, FrameStream, FrameSummary
+
+# Each screen edge, plus the whole screen
+ZONES = (*EDGES, "screen")
+
+# CIE76 color difference below which most people see no change
+JUST_NOTICEABLE_DIFFERENCE = 2.3
+
+# Linear sRGB to CIE XYZ, relative to the D65 white point
+SRGB_TO_XYZ = np.array(
+    [
+        [0.4124, 0.3576, 0.1805],
+        [0.2126, 0.7152, 0.0722],
+        [0.0193, 0.1192, 0.9505],
+    ]
+)
+D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+@dataclass
+class MirrorTarget:
+    """A light following one zone of the screen."""
+
+    entity_id: str
+    zone: str
+    max_rate: float = MIRROR_RATE
+    threshold: float = MIRROR_THRESHOLD
+    last_attempt: float = float("-inf")
+    last_write: float = float("-inf")
+    last_lab: np.ndarray | None = None
+    writes: int = 0
+    rate_limited: int = 0
+    imperceptible: int = 0
+    busy: int = 0
+    errors: int = 0
+    write_times: deque[float] = field(default_factory=deque)
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+    task: asyncio.Task | None = None
+
+    @property
+    def update_rate(self) -> float:
+        """Return writes per second over the recent rate window."""
+        self._expire_writes(monotonic())
+        return len(self.write_times) / MIRROR_RATE_WINDOW
+
+    def record_write(self, now: float, captured: float) -> None:
+        """Count a completed write of a color captured at ``captured``."""
+        self.writes += 1
+        self.write_times.append(now)
+        self._expire_writes(now)
+        self.latencies.append(now - captured)
+
+    def _expire_writes(self, now: float) -> None:
+        """Drop write times that fell out of the rate window."""
+        cutoff = now - MIRROR_RATE_WINDOW
+        while self.write_times and self.write_times[0] < cutoff:
+            self.write_times.popleft()
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return write counters, update rate and latency percentiles."""
+        latencies = sorted(self.latencies)
+        return {
+            "zone": self.zone,
+            "max_rate": self.max_rate,
+            "threshold": self.threshold,
+            "update_rate": self.update_rate,
+            "writes": self.writes,
+            "rate_limited": self.rate_limited,
+            "imperceptible": self.imperceptible,
+            "busy": self.busy,
+            "errors": self.errors,
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p95": _percentile(latencies, 0.95),
+        }
+
+
+class AmbientMirror:
+    """Drive other lights from the colors Glimmr is capturing.
+
+    Frames are sampled at a fixed interval and reduced to the dominant color
+    of each zone, which is smoothed over time so cuts and flicker do not make
+    lamps jump. A target is written at most ``max_rate`` times per second, and
+    only when its zone moved by at least ``threshold`` in CIELAB, never less
+    than a just noticeable difference. Each target has at most one write in
+    flight; latency is measured from frame arrival to the write completing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        frames: FrameStream,
+        subscribe: Callable[[Callable[[FrameSummary], None], float], CALLBACK_TYPE],
+    ) -> None:
+        """Initialize the mirror."""
+        self.hass = hass
+        self._frames = frames
+        self._subscribe = subscribe
+        self._unsub_frames: CALLBACK_TYPE | None = None
+        self.targets: dict[str, MirrorTarget] = {}
+        self._zones: tuple[tuple[int, FrameLayout], np.ndarray, np.ndarray] | None = None
+        self._smoothed: np.ndarray | None = None
+        self._sampled_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Return if any light is following the screen."""
+        return self._unsub_frames is not None
+
+    @callback
+    def async_start(
+        self,
+        entity_ids: list[str],
+        zone: str,
+        max_rate: float = MIRROR_RATE,
+        threshold: float = MIRROR_THRESHOLD,
+    ) -> None:
+        """Make lights follow a zone, replacing any zone they already followed."""
+        for entity_id in entity_ids:
+            self.targets[entity_id] = MirrorTarget(entity_id, zone, max_rate, threshold)
+        if self._unsub_frames is None and self.targets:
+            self._unsub_frames = self._subscribe(self._async_sample, MIRROR_SAMPLE_INTERVAL)
+
+    @callback
+    def async_stop(self, entity_ids: list[str] | None = None) -> None:
+        """Stop lights following the screen, or all of them."""
+        for entity_id in list(self.targets) if entity_ids is None else entity_ids:
+            self.targets.pop(entity_id, None)
+        if not self.targets and self._unsub_frames is not None:
+            self._unsub_frames()
+            self._unsub_frames = None
+            self._smoothed = None
+
+    @callback
+    def _async_sample(self, summary: FrameSummary) -> None:
+        """Smooth the latest frame's zone colors and write targets that changed."""
+        frame = self._frames.latest
+        if frame is None or not len(frame):
+            return
+        colors = self._zone_colors(frame)
+        if self._smoothed is None:
+            self._smoothed = colors
+        else:
+            elapsed = max(0.0, summary.timestamp - self._sampled_at)
+            alpha = 1.0 - math.exp(-elapsed / MIRROR_SMOOTHING)
+            self._smoothed += alpha * (colors - self._smoothed)
+        self._sampled_at = summary.timestamp
+        lab = rgb_to_lab(self._smoothed)
+
+        now = monotonic()
+        for target in self.targets.values():
+            if target.task is not None and not target.task.done():
+                target.busy += 1
+                continue
+            # Attempts are rate capped too, so a failing light is not hammered.
+            if now - target.last_attempt < 1.0 / target.max_rate:
+                target.rate_limited += 1
+                continue
+            zone = ZONES.index(target.zone)
+            if target.last_lab is not None and np.linalg.norm(
+                lab[zone] - target.last_lab
+            ) < max(target.threshold, JUST_NOTICEABLE_DIFFERENCE):
+                target.imperceptible += 1
+                continue
+            target.last_attempt = now
+            target.task = self.hass.async_create_task(
+                self._async_write(
+                    target, self._smoothed[zone].copy(), lab[zone], summary.timestamp
+                )
+            )
+
+    def _zone_colors(self, frame: np.ndarray) -> np.ndarray:
+        """Return the dominant color of each zone as a ``(zones, 3)`` float array.
+
+        All zones are reduced together: pixels are gathered per zone, binned
+        by quantized color with the zone as the high part of the bin, and the
+        pixels of each zone's fullest bin are averaged.
+        """
+        key = (len(frame), self._frames.layout)
+        if self._zones is None or self._zones[0] != key:
+            edges = self._frames.layout.edge_indices(len(frame))
+            # Without a matching layout, every zone follows the whole screen.
+            indices = [edges.get(edge, np.arange(len(frame))) for edge in EDGES]
+            indices.append(np.arange(len(frame)))
+            owners = np.repeat(np.arange(len(ZONES)), [len(idx) for idx in indices])
+            self._zones = (key, np.concatenate(indices), owners)
+        _, pixels, owners = self._zones
+
+        colors = frame[pixels]
+        quant = (colors >> (8 - DOMINANT_BITS)).astype(np.intp)
+        bins = 1 << (3 * DOMINANT_BITS)
+        codes = (quant[:, 0] << (2 * DOMINANT_BITS)) | (quant[:, 1] << DOMINANT_BITS) | quant[:, 2]
+        counts = np.bincount(owners * bins + codes, minlength=len(ZONES) * bins)
+        winners = counts.reshape(len(ZONES), bins).argmax(axis=1)
+        chosen = codes == winners[owners]
+        weights = np.bincount(owners[chosen], minlength=len(ZONES))
+        sums = np.stack(
+            [
+                np.bincount(owners[chosen], colors[chosen, channel], len(ZONES))
+                for channel in range(3)
+            ],
+            axis=1,
+        )
+        return sums / np.maximum(weights, 1)[:, None]
+
+    async def _async_write(
+        self,
+        target: MirrorTarget,
+        color: np.ndarray,
+        lab: np.ndarray,
+        captured: float,
+    ) -> None:
+        """Set a target light to a color captured at ``captured``.
+
+        The target only remembers the color once the light accepted it, so a
+        failed write is retried on the next sample even if the screen holds.
+        """
+        started = monotonic()
+        level = float(color.max())
+        # Carry the level as brightness so dark scenes dim the lamp.
+        rgb = color * (255.0 / level) if level else color
+        try:
+            await self.hass.services.async_call(
+                LIGHT_DOMAIN,
+                SERVICE_TURN_ON,
+                {
+                    ATTR_ENTITY_ID: target.entity_id,
+                    ATTR_RGB_COLOR: tuple(int(round(c)) for c in rgb),
+                    ATTR_BRIGHTNESS: int(round(level)),
+                },
+                blocking=True,
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # Any failure is confined to this target, never the sampling loop.
+            target.errors += 1
+            LOGGER.debug("Failed mirroring to %s: %s", target.entity_id, err)
+            return
+        target.last_write = started
+        target.last_lab = lab
+        target.record_write(monotonic(), captured)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return per-target mirroring metrics."""
+        return {
+            entity_id: target.diagnostics() for entity_id, target in self.targets.items()
+        }
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an array of sRGB colors in 0-255 to CIELAB."""
+    srgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ SRGB_TO_XYZ.T / D65_WHITE
+    delta = 6 / 29
+    scaled = np.where(xyz > delta**3, np.cbrt(xyz), xyz / (3 * delta**2) + 4 / 29)
+    return np.stack(
+        (
+            116 * scaled[..., 1] - 16,
+            500 * (scaled[..., 0] - scaled[..., 1]),
+            200 * (scaled[..., 1] - scaled[..., 2]),
+        ),
+        axis=-1,
+    )
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    """Return a percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
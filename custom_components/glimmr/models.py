@@ -0,0 +1,41 @@
+"""Models for Glimmr."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+
+from glimmr import SystemData
+
+
+@dataclass(frozen=True)
+class GlimmrState:
+    """Immutable snapshot of the device fields the integration uses."""
+
+    mode: int
+    auto_disabled: bool
+    ambient_color: str
+    ambient_scene: int
+    previous_mode: int
+    name: str
+
+    @classmethod
+    def from_system_data(cls, data: SystemData) -> GlimmrState:
+        """Capture the relevant fields of a device's system data."""
+        return cls(
+            mode=data.device_mode,
+            auto_disabled=data.auto_disabled,
+            ambient_color=data.ambient_color,
+            ambient_scene=data.ambient_scene,
+            previous_mode=data.previous_mode,
+            name=data.device_name,
+        )
+
+    def diff(self, other: GlimmrState | None) -> frozenset[str]:
+        """Return the names of fields that differ from another snapshot."""
+        if other is None:
+            return STATE_FIELDS
+        return frozenset(
+            name for name in STATE_FIELDS if getattr(self, name) != getattr(other, name)
+        )
+
+
+STATE_FIELDS = frozenset(field.name for field in fields(GlimmrState))
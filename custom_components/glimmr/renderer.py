@@ -0,0 +1,226 @@
+"""Integration-side effect rendering streamed to Glimmr."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import monotonic
+
+import numpy as np
+
+from .const import LOGGER, STREAM_FPS, STREAM_PORT
+from .frames import FrameLayout
+
+# WLED realtime protocols understood by Glimmr's UDP stream source
+PROTOCOL_DRGB = 2
+PROTOCOL_DNRGB = 4
+DRGB_MAX_LEDS = 490
+DNRGB_CHUNK = 489
+# Seconds the device waits without frames before leaving realtime mode
+STREAM_TIMEOUT = 2
+
+# Renders a (leds, 3) uint8 frame for a time in seconds
+Effect = Callable[[int, float], np.ndarray]
+
+
+def rainbow(leds: int, now: float, speed: float = 0.1) -> np.ndarray:
+    """Return a hue wheel around the screen, rotating over time."""
+    hue = (np.arange(leds) / max(leds, 1) + now * speed) % 1.0
+    return hsv_to_rgb(hue, 1.0, 1.0)
+
+
+def chase(
+    leds: int,
+    now: float,
+    color: tuple[int, int, int] = (255, 255, 255),
+    width: float = 8.0,
+    speed: float = 30.0,
+) -> np.ndarray:
+    """Return a fading comet running around the screen at ``speed`` LEDs per second."""
+    head = (now * speed) % max(leds, 1)
+    distance = (head - np.arange(leds)) % max(leds, 1)
+    level = np.clip(1.0 - distance / width, 0.0, 1.0)
+    return (level[:, None] * np.asarray(color, dtype=np.float32)).astype(np.uint8)
+
+
+def gradient(
+    leds: int,
+    now: float,
+    start: tuple[int, int, int] = (255, 0, 80),
+    end: tuple[int, int, int] = (0, 80, 255),
+    speed: float = 0.05,
+) -> np.ndarray:
+    """Return a two color gradient that cycles around the screen."""
+    phase = (np.arange(leds) / max(leds, 1) + now * speed) % 1.0
+    mix = (1.0 - np.cos(phase * 2 * np.pi)) / 2
+    colors = np.asarray((start, end), dtype=np.float32)
+    return (colors[0] + mix[:, None] * (colors[1] - colors[0])).astype(np.uint8)
+
+
+def solid(color: Callable[[], tuple[int, int, int] | None]) -> Effect:
+    """Return an effect filling the screen with a color read at render time."""
+
+    def _render(leds: int, _now: float) -> np.ndarray:
+        return np.tile(np.asarray(color() or (0, 0, 0), dtype=np.uint8), (leds, 1))
+
+    return _render
+
+
+# Named apart from device scenes, which may use the same words
+EFFECTS: dict[str, Effect] = {
+    "Streamed rainbow": rainbow,
+    "Streamed chase": chase,
+    "Streamed gradient": gradient,
+}
+
+
+def hsv_to_rgb(hue: np.ndarray, sat: float, val: float) -> np.ndarray:
+    """Convert an array of hues to uint8 RGB."""
+    sector = np.floor(hue * 6).astype(np.intp) % 6
+    frac = hue * 6 - np.floor(hue * 6)
+    p = np.full_like(hue, val * (1 - sat))
+    q = val * (1 - frac * sat)
+    t = val * (1 - (1 - frac) * sat)
+    v = np.full_like(hue, val)
+    channels = np.stack(
+        (
+            np.choose(sector, (v, q, p, p, t, v)),
+            np.choose(sector, (t, v, v, q, p, p)),
+            np.choose(sector, (p, p, t, v, v, q)),
+        ),
+        axis=-1,
+    )
+    return (channels * 255).astype(np.uint8)
+
+
+def stream_packets(frame: np.ndarray) -> list[bytes]:
+    """Return the realtime UDP packets carrying a frame."""
+    if len(frame) <= DRGB_MAX_LEDS:
+        return [bytes((PROTOCOL_DRGB, STREAM_TIMEOUT)) + frame.tobytes()]
+    return [
+        bytes((PROTOCOL_DNRGB, STREAM_TIMEOUT, start >> 8, start & 0xFF))
+        + frame[start : start + DNRGB_CHUNK].tobytes()
+        for start in range(0, len(frame), DNRGB_CHUNK)
+    ]
+
+
+@dataclass
+class RenderStats:
+    """Timing of the render loop."""
+
+    frames: int = 0
+    dropped: int = 0
+    render_time: float | None = None
+    max_render_time: float = 0.0
+    interval: float | None = None
+
+
+class EffectRenderer:
+    """Render an effect per frame and stream it to a device over UDP.
+
+    Frames are paced against a fixed schedule. When the loop falls behind,
+    or the socket has not drained the previous frame, the frame is dropped
+    rather than queued, so the device always shows the newest frame.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = STREAM_PORT,
+        on_stop: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the renderer.
+
+        ``on_stop`` is called when an effect ends on its own rather than
+        through ``async_stop``.
+        """
+        self.host = host
+        self.port = port
+        self.effect_name: str | None = None
+        self.stats = RenderStats()
+        self._on_stop = on_stop
+        self._transport: asyncio.DatagramTransport | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return if an effect is streaming."""
+        return self._task is not None and not self._task.done()
+
+    async def async_start(
+        self, name: str, effect: Effect, layout: FrameLayout, fps: float = STREAM_FPS
+    ) -> None:
+        """Start streaming an effect, replacing any running one."""
+        await self.async_stop()
+        leds = layout.led_count
+        if not leds:
+            raise ValueError("Device reports no LEDs to stream to")
+        if self._transport is None:
+            self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                asyncio.DatagramProtocol, remote_addr=(self.host, self.port)
+            )
+        self.effect_name = name
+        self.stats = RenderStats()
+        self._task = asyncio.get_running_loop().create_task(
+            self._async_run(effect, leds, 1 / fps)
+        )
+
+    async def async_stop(self) -> None:
+        """Stop streaming and release the socket."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._release()
+
+    def _release(self) -> None:
+        """Close the socket and forget the effect."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        self.effect_name = None
+
+    async def _async_run(self, effect: Effect, leds: int, interval: float) -> None:
+        """Render and send frames until cancelled."""
+        loop = asyncio.get_running_loop()
+        stats = self.stats
+        stats.interval = interval
+        started = deadline = loop.time()
+        while True:
+            deadline += interval
+            now = loop.time()
+            if now > deadline:
+                # Behind schedule: skip the missed frames and resync.
+                missed = int((now - deadline) / interval) + 1
+                stats.dropped += missed
+                deadline += missed * interval
+            await asyncio.sleep(deadline - now)
+
+            transport = self._transport
+            if transport is None:
+                return
+            if transport.get_write_buffer_size():
+                stats.dropped += 1
+                continue
+
+            render_started = monotonic()
+            try:
+                frame = effect(leds, deadline - started)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Effect %s failed, stopping stream", self.effect_name)
+                self._release()
+                if self._on_stop is not None:
+                    self._on_stop()
+                return
+            for packet in stream_packets(frame):
+                transport.sendto(packet)
+            stats.render_time = elapsed = monotonic() - render_started
+            stats.max_render_time = max(stats.max_render_time, elapsed)
+            stats.frames += 1
+
+    def diagnostics(self) -> dict[str, float | int | str | None]:
+        """Return render loop metrics."""
+        return {"effect": self.effect_name, **vars(self.stats)}
@@ -0,0 +1,74 @@
+"""Subnet scanning for Glimmr devices."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import ipaddress
+
+import aiohttp
+import async_timeout
+from glimmr import SystemData
+
+from .const import LOGGER, SCAN_CONCURRENCY, SCAN_MAX_HOSTS, SCAN_TIMEOUT
+
+SYSTEM_DATA_PATH = "/api/Glimmr/systemData"
+
+
+@dataclass(frozen=True)
+class DiscoveredGlimmr:
+    """A Glimmr device found by a subnet scan."""
+
+    host: str
+    device_id: str
+    name: str
+
+
+async def async_scan_network(
+    session: aiohttp.ClientSession,
+    network: str,
+    *,
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_TIMEOUT,
+) -> list[DiscoveredGlimmr]:
+    """Probe every host of a CIDR range for a Glimmr system config.
+
+    Raises ValueError if the range is invalid or larger than SCAN_MAX_HOSTS.
+    """
+    subnet = ipaddress.ip_network(network, strict=False)
+    if subnet.num_addresses > SCAN_MAX_HOSTS:
+        raise ValueError(f"{network} has more than {SCAN_MAX_HOSTS} addresses")
+
+    hosts = list(subnet.hosts()) or [subnet.network_address]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str) -> DiscoveredGlimmr | None:
+        async with semaphore:
+            return await async_probe_host(session, host, timeout)
+
+    results = await asyncio.gather(*(_probe(str(host)) for host in hosts))
+    found = [device for device in results if device is not None]
+    LOGGER.debug("Scanned %s hosts in %s, found %s Glimmr", len(hosts), network, len(found))
+    return found
+
+
+async def async_probe_host(
+    session: aiohttp.ClientSession, host: str, timeout: float = SCAN_TIMEOUT
+) -> DiscoveredGlimmr | None:
+    """Return the Glimmr device answering at host, if any."""
+    try:
+        async with async_timeout.timeout(timeout):
+            async with session.get(f"http://{host}{SYSTEM_DATA_PATH}") as response:
+                if response.status != 200:
+                    return None
+                data = await response.json(content_type=None)
+    except (asyncio.TimeoutError, aiohttp.ClientError, OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or "deviceId" not in data:
+        return None
+    system_data = SystemData.from_dict(data)
+    return DiscoveredGlimmr(
+        host=host,
+        device_id=system_data.device_id,
+        name=system_data.device_name or host,
+    )
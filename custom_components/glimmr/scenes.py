@@ -0,0 +1,57 @@
+"""Scene and mode effect lookup for Glimmr."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+# Glimmr hides device modes in the scene list as negative pseudo scene ids.
+EFFECT_TO_MODE: Mapping[int, int] = MappingProxyType(
+    {-2: 1, -3: 2, -4: 3, -5: 4, -6: 5, -7: 6}
+)
+# Device modes reported as their pseudo scene; other modes report the ambient scene.
+MODE_TO_EFFECT: Mapping[int, int] = MappingProxyType({1: -2, 2: -3, 4: -5, 5: -6})
+
+
+@dataclass(frozen=True)
+class SceneCatalog:
+    """Two-way index of ambient scenes and mode pseudo effects."""
+
+    key: tuple[Any, frozenset[tuple[str, int]]]
+    names: tuple[str, ...] = ()
+    by_name: Mapping[str, int] = field(default_factory=dict)
+    by_id: Mapping[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: Any, scenes: Mapping[str, int] | None) -> SceneCatalog:
+        """Index a device scene mapping of name to id."""
+        scenes = scenes or {}
+        by_id: dict[int, str] = {}
+        for name, scene_id in scenes.items():
+            by_id.setdefault(scene_id, name)
+        return cls(
+            key=catalog_key(version, scenes),
+            names=tuple(scenes),
+            by_name=MappingProxyType(dict(scenes)),
+            by_id=MappingProxyType(by_id),
+        )
+
+    def scene_id(self, name: str) -> int | None:
+        """Return the scene id for an effect name."""
+        return self.by_name.get(name)
+
+    def mode_for(self, scene_id: int) -> int | None:
+        """Return the device mode selected by a pseudo scene id, if any."""
+        return EFFECT_TO_MODE.get(scene_id)
+
+    def effect_name(self, mode: int, ambient_scene: int) -> str | None:
+        """Return the effect name shown for a device mode and ambient scene."""
+        return self.by_id.get(MODE_TO_EFFECT.get(mode, ambient_scene))
+
+
+def catalog_key(
+    version: Any, scenes: Mapping[str, int] | None
+) -> tuple[Any, frozenset[tuple[str, int]]]:
+    """Return the cache key identifying a device's scene set."""
+    return version, frozenset((scenes or {}).items())
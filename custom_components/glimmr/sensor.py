@@ -0,0 +1,183 @@
+"""Support for Glimmr device stats sensors."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, TEMP_CELSIUS, TIME_SECONDS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import GlimmrDataUpdateCoordinator
+from .entity import GlimmrEntity
+from .stats import FPS_PREFIX
+
+SENSORS: dict[str, SensorEntityDescription] = {
+    "cpu_usage": SensorEntityDescription(
+        key="cpu_usage",
+        name="CPU usage",
+        icon="mdi:cpu-64-bit",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_registry_enabled_default=False,
+    ),
+    "cpu_temp": SensorEntityDescription(
+        key="cpu_temp",
+        name="CPU temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        entity_registry_enabled_default=False,
+    ),
+    "memory_usage": SensorEntityDescription(
+        key="memory_usage",
+        name="Memory usage",
+        icon="mdi:memory",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_registry_enabled_default=False,
+    ),
+}
+
+
+def _description(metric: str) -> SensorEntityDescription:
+    """Return the description for a metric, including per-source FPS."""
+    if (description := SENSORS.get(metric)) is not None:
+        return description
+    source = metric[len(FPS_PREFIX):] if metric.startswith(FPS_PREFIX) else metric
+    return SensorEntityDescription(
+        key=metric,
+        name=f"{source.replace('_', ' ').capitalize()} FPS",
+        icon="mdi:speedometer",
+        native_unit_of_measurement="fps",
+        entity_registry_enabled_default=False,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Glimmr stats sensors, adding FPS sources as the device reports them."""
+    coordinator: GlimmrDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    known: set[str] = set()
+
+    @callback
+    def _async_add_new_metrics() -> None:
+        new = [
+            metric
+            for metric in coordinator.stats.metrics
+            if metric.startswith(FPS_PREFIX) and metric not in known
+        ]
+        if new:
+            known.update(new)
+            async_add_entities(
+                GlimmrStatSensor(coordinator, _description(metric)) for metric in new
+            )
+
+    # Device metrics are always reported, so their sensors exist up front.
+    # They are disabled by default, as each enabled one keeps the stats
+    # stream subscribed; polling never returns stats.
+    async_add_entities(
+        [
+            GlimmrPollIntervalSensor(coordinator),
+            *(
+                GlimmrStatSensor(coordinator, description)
+                for description in SENSORS.values()
+            ),
+        ]
+    )
+    _async_add_new_metrics()
+    # Capture sources vary, so their FPS sensors are added once a stats
+    # window reports them; only enabled sensors keep the stream subscribed.
+    entry.async_on_unload(
+        coordinator.async_add_stats_listener(_async_add_new_metrics, stream=False)
+    )
+
+
+class GlimmrStatSensor(GlimmrEntity, SensorEntity):
+    """Windowed mean of a Glimmr device metric."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: GlimmrDataUpdateCoordinator,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        system_data = coordinator.glimmr.system_data
+        self._attr_name = f"{system_data.device_name} {description.name}"
+        self._attr_unique_id = f"{system_data.device_id}_{description.key}"
+        self._written_available: bool | None = None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean over the last stats window."""
+        if (result := self.coordinator.stats.values.get(self.entity_description.key)) is None:
+            return None
+        return result.mean
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the window's extremes."""
+        if (result := self.coordinator.stats.values.get(self.entity_description.key)) is None:
+            return None
+        return {"min": result.minimum, "max": result.maximum}
+
+    async def async_added_to_hass(self) -> None:
+        """Write state once per stats window rather than per message."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_stats_listener(self.async_write_ha_state)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write coordinator updates that change availability."""
+        if self.coordinator.last_update_success != self._written_available:
+            self._written_available = self.coordinator.last_update_success
+            self.async_write_ha_state()
+
+
+class GlimmrPollIntervalSensor(GlimmrEntity, SensorEntity):
+    """Effective polling interval of a Glimmr device."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_native_unit_of_measurement = TIME_SECONDS
+
+    def __init__(self, coordinator: GlimmrDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        system_data = coordinator.glimmr.system_data
+        self._attr_name = f"{system_data.device_name} Polling interval"
+        self._attr_unique_id = f"{system_data.device_id}_poll_interval"
+        self._written: float | None = None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the polling interval, or None while the device pushes its state."""
+        if (interval := self.coordinator.update_interval) is None:
+            return None
+        return interval.total_seconds()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether the device is pushing its state instead."""
+        return {"push": self.coordinator.socket.connected}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write updates that change the interval."""
+        if self.native_value != self._written:
+            self._written = self.native_value
+            self.async_write_ha_state()
@@ -0,0 +1,382 @@
+"""Asyncio SignalR client for the Glimmr device socket."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import re
+from typing import Any
+
+import aiohttp
+import async_timeout
+import msgpack
+
+from .const import LOGGER
+
+RECORD_SEPARATOR = "\x1e"
+PROTOCOL_JSON = "json"
+PROTOCOL_MESSAGEPACK = "messagepack"
+CONNECT_TIMEOUT = 10
+KEEPALIVE_INTERVAL = 15
+
+# SignalR hub message types
+MESSAGE_INVOCATION = 1
+MESSAGE_PING = 6
+MESSAGE_CLOSE = 7
+
+# Finds an invocation's target without decoding the whole record
+TARGET_PATTERN = re.compile(r'"target"\s*:\s*"([^"]*)"')
+
+# Payload maps whose keys are read by the handlers, below the top level
+CAMEL_NESTED = frozenset({"systemData", "ambientScenes", "stats", "fps"})
+
+# Raised by a single malformed MessagePack record
+UNPACK_ERRORS = (ValueError, TypeError, msgpack.UnpackException)
+
+
+class GlimmrSocketError(Exception):
+    """Raised when the Glimmr socket cannot be opened."""
+
+
+class GlimmrHandshakeError(GlimmrSocketError):
+    """Raised when the device rejects the hub handshake."""
+
+
+class GlimmrSocket:
+    """SignalR hub connection to a Glimmr device running on the event loop.
+
+    Handlers are invoked on the event loop with the invocation's argument
+    list, so they may safely touch Home Assistant state directly.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession,
+        protocol: str = PROTOCOL_JSON,
+    ) -> None:
+        """Initialize the socket."""
+        self.host = host
+        self.protocol = protocol
+        self._session = session
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._opened = False
+        self._reader: asyncio.Task | None = None
+        self._keepalive: asyncio.Task | None = None
+        self._handlers: dict[str, list[Callable[[list[Any]], None]]] = {}
+        self._open_handlers: list[Callable[[], None]] = []
+        self._close_handlers: list[Callable[[], None]] = []
+
+    @property
+    def connected(self) -> bool:
+        """Return if the hub connection is open."""
+        return self._ws is not None and not self._ws.closed
+
+    def on(self, target: str, handler: Callable[[list[Any]], None]) -> Callable[[], None]:
+        """Register a handler for a hub method, returning an unsubscribe callable."""
+        handlers = self._handlers.setdefault(target, [])
+        handlers.append(handler)
+        return lambda: handlers.remove(handler)
+
+    def on_open(self, handler: Callable[[], None]) -> Callable[[], None]:
+        """Register a handler called once the hub handshake completes."""
+        self._open_handlers.append(handler)
+        return lambda: self._open_handlers.remove(handler)
+
+    def on_close(self, handler: Callable[[], None]) -> Callable[[], None]:
+        """Register a handler called when an open connection closes."""
+        self._close_handlers.append(handler)
+        return lambda: self._close_handlers.remove(handler)
+
+    async def connect(self) -> None:
+        """Open the hub connection, falling back to JSON if MessagePack is refused."""
+        if self.connected:
+            return
+
+        try:
+            await self._async_open(self.protocol)
+        except GlimmrHandshakeError as err:
+            if self.protocol == PROTOCOL_JSON:
+                raise
+            LOGGER.debug("%s, falling back to JSON", err)
+            self.protocol = PROTOCOL_JSON
+            await self._async_open(self.protocol)
+
+        LOGGER.debug("Socket connected to %s using %s", self.host, self.protocol)
+        self._opened = True
+        loop = asyncio.get_running_loop()
+        self._reader = loop.create_task(self._listen())
+        self._keepalive = loop.create_task(self._ping())
+        for handler in list(self._open_handlers):
+            handler()
+
+    async def _async_open(self, protocol: str) -> None:
+        """Negotiate, open the websocket and complete the hub handshake."""
+        base = f"http://{self.host}/socket"
+        try:
+            async with async_timeout.timeout(CONNECT_TIMEOUT):
+                response = await self._session.post(
+                    f"{base}/negotiate", params={"negotiateVersion": 1}
+                )
+                negotiate = await response.json(content_type=None)
+                if protocol != PROTOCOL_JSON and not _supports_binary(negotiate):
+                    raise GlimmrHandshakeError(
+                        f"{self.host} does not offer binary websocket transfers"
+                    )
+                token = negotiate.get("connectionToken") or negotiate.get("connectionId")
+                # Heartbeats close the socket when a rebooting device stops answering.
+                self._ws = await self._session.ws_connect(
+                    f"ws://{self.host}/socket",
+                    params={"id": token},
+                    heartbeat=KEEPALIVE_INTERVAL,
+                )
+                handshake = {"protocol": protocol, "version": 1}
+                await self._ws.send_str(json.dumps(handshake) + RECORD_SEPARATOR)
+                reply = await self._ws.receive()
+        except (asyncio.TimeoutError, aiohttp.ClientError, ValueError) as err:
+            await self._close_ws()
+            raise GlimmrSocketError(
+                f"Unable to open socket to Glimmr device at {self.host}"
+            ) from err
+
+        # The handshake reply is JSON for every protocol.
+        data = reply.data
+        if reply.type == aiohttp.WSMsgType.BINARY:
+            data = data.decode("utf-8", errors="replace")
+        records = (
+            _decode(data)
+            if reply.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY)
+            else []
+        )
+        if not records or "error" in records[0]:
+            await self._close_ws()
+            raise GlimmrHandshakeError(f"Hub handshake rejected by {self.host}: {data}")
+
+    async def disconnect(self) -> None:
+        """Close the hub connection and stop background tasks."""
+        for task in (self._keepalive, self._reader):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._keepalive = self._reader = None
+        # The device or a missed heartbeat may already have closed the
+        # websocket, so track the connection rather than reading its state.
+        was_opened, self._opened = self._opened, False
+        await self._close_ws()
+        if was_opened:
+            LOGGER.debug("Socket to %s closed", self.host)
+            for handler in list(self._close_handlers):
+                handler()
+
+    async def send(self, target: str, *arguments: Any) -> None:
+        """Invoke a hub method on the device without waiting for a result."""
+        if not self.connected:
+            raise GlimmrSocketError(f"Socket to {self.host} is not connected")
+        if self.protocol == PROTOCOL_MESSAGEPACK:
+            await self._ws.send_bytes(
+                _frame_msgpack([MESSAGE_INVOCATION, {}, None, target, list(arguments)])
+            )
+            return
+        message = {"type": MESSAGE_INVOCATION, "target": target, "arguments": list(arguments)}
+        await self._ws.send_str(json.dumps(message) + RECORD_SEPARATOR)
+
+    async def _close_ws(self) -> None:
+        """Close the underlying websocket, if any."""
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            await ws.close()
+
+    async def _ping(self) -> None:
+        """Keep the hub connection alive while no user traffic is sent."""
+        while self.connected:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            try:
+                if self.protocol == PROTOCOL_MESSAGEPACK:
+                    await self._ws.send_bytes(_frame_msgpack([MESSAGE_PING]))
+                else:
+                    await self._ws.send_str(
+                        json.dumps({"type": MESSAGE_PING}) + RECORD_SEPARATOR
+                    )
+            except (ConnectionError, aiohttp.ClientError, AttributeError):
+                return
+
+    async def _listen(self) -> None:
+        """Read hub messages and dispatch invocations to handlers."""
+        ws = self._ws
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    messages = _decode(msg.data, self._wanted)
+                elif msg.type == aiohttp.WSMsgType.BINARY:
+                    messages = _decode_msgpack(msg.data, self._wanted)
+                elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.ERROR):
+                    break
+                else:
+                    continue
+                for message in messages:
+                    msg_type = message.get("type")
+                    if msg_type == MESSAGE_INVOCATION:
+                        self._dispatch(message.get("target"), message.get("arguments", []))
+                    elif msg_type == MESSAGE_CLOSE:
+                        LOGGER.debug("Socket to %s closed by device", self.host)
+                        return
+        except (ConnectionError, aiohttp.ClientError) as err:
+            LOGGER.debug("Socket to %s failed: %s", self.host, err)
+        finally:
+            await self.disconnect()
+
+    def _wanted(self, target: str) -> bool:
+        """Return if any handler is registered for a hub method."""
+        return bool(self._handlers.get(target))
+
+    def _dispatch(self, target: str | None, arguments: list[Any]) -> None:
+        """Call every handler registered for a hub method."""
+        for handler in list(self._handlers.get(target, ())):
+            try:
+                handler(arguments)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Error handling %s from %s", target, self.host)
+
+
+def _decode(
+    data: str, wanted: Callable[[str], bool] | None = None
+) -> list[dict[str, Any]]:
+    """Split a text frame into its JSON hub messages.
+
+    Invocations whose target fails ``wanted`` are skipped before decoding,
+    and malformed records are skipped without failing the rest.
+    """
+    messages = []
+    for record in data.split(RECORD_SEPARATOR):
+        if not record:
+            continue
+        if wanted is not None and (match := TARGET_PATTERN.search(record, 0, 64)):
+            if not wanted(match.group(1)):
+                continue
+        try:
+            message = json.loads(record)
+        except ValueError as err:
+            LOGGER.debug("Skipping malformed hub message: %s", err)
+            continue
+        if isinstance(message, dict):
+            messages.append(message)
+    return messages
+
+
+def _decode_msgpack(
+    data: bytes, wanted: Callable[[str], bool] | None = None
+) -> list[dict[str, Any]]:
+    """Split a binary frame into its MessagePack hub messages.
+
+    Each message is prefixed with its length as a 7-bit varint. Invocations
+    whose target fails ``wanted`` are skipped before their arguments are
+    unpacked, and malformed records are skipped without failing the rest.
+    """
+    messages = []
+    view = memoryview(data)
+    pos = 0
+    while pos < len(view):
+        try:
+            length, pos = _read_varint(view, pos)
+        except ValueError as err:
+            # Without a length the next record cannot be found.
+            LOGGER.debug("Dropping rest of hub frame: %s", err)
+            break
+        record = view[pos : pos + length]
+        pos += length
+        try:
+            message = _unpack_record(record, wanted)
+        except UNPACK_ERRORS as err:
+            LOGGER.debug("Skipping malformed hub message: %s", err)
+            continue
+        if message is not None:
+            messages.append(message)
+    return messages
+
+
+def _unpack_record(
+    record: memoryview, wanted: Callable[[str], bool] | None
+) -> dict[str, Any] | None:
+    """Unpack one MessagePack hub message, or None if it is not wanted."""
+    unpacker = msgpack.Unpacker(raw=False)
+    unpacker.feed(record)
+    fields = unpacker.read_array_header()
+    msg_type = unpacker.unpack()
+    if msg_type != MESSAGE_INVOCATION:
+        return {"type": msg_type}
+    unpacker.skip()  # headers
+    unpacker.skip()  # invocation id
+    target = unpacker.unpack()
+    if wanted is not None and not wanted(target):
+        return None
+    arguments = unpacker.unpack() if fields > 4 else []
+    if _is_pascal_case(arguments):
+        arguments = [_camel_keys(argument) for argument in arguments]
+    return {"type": msg_type, "target": target, "arguments": arguments}
+
+
+def _frame_msgpack(message: list[Any]) -> bytes:
+    """Encode a hub message as a length-prefixed MessagePack record."""
+    body = msgpack.packb(message, use_bin_type=True)
+    prefix = bytearray()
+    length = len(body)
+    while True:
+        byte = length & 0x7F
+        length >>= 7
+        if length:
+            prefix.append(byte | 0x80)
+        else:
+            prefix.append(byte)
+            return bytes(prefix) + body
+
+
+def _read_varint(data: memoryview, pos: int) -> tuple[int, int]:
+    """Read a 7-bit varint, returning its value and the following offset."""
+    value = shift = 0
+    while True:
+        if pos >= len(data) or shift > 28:
+            raise ValueError("Truncated MessagePack length prefix")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _camel_keys(value: Any) -> Any:
+    """Lower-case the first letter of map keys, matching the JSON protocol.
+
+    The MessagePack protocol keeps the device's C# member names, while the
+    JSON protocol and the models expect camelCase. Only the top level and
+    the ``CAMEL_NESTED`` maps the handlers read are rebuilt; other values
+    are passed through untouched.
+    """
+    if isinstance(value, list):
+        return [_camel_keys(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        if isinstance(key, str):
+            key = key[:1].lower() + key[1:]
+        result[key] = _camel_keys(item) if key in CAMEL_NESTED else item
+    return result
+
+
+def _is_pascal_case(arguments: list[Any]) -> bool:
+    """Return if the first map argument uses C# member names."""
+    for argument in arguments:
+        if isinstance(argument, dict):
+            key = next(iter(argument), None)
+            return isinstance(key, str) and key[:1].isupper()
+    return False
+
+
+def _supports_binary(negotiate: dict[str, Any]) -> bool:
+    """Return if a negotiate response offers binary websocket transfers."""
+    if "availableTransports" not in negotiate:
+        return True
+    for transport in negotiate.get("availableTransports", ()):
+        if transport.get("transport") == "WebSockets":
+            return "Binary" in transport.get("transferFormats", ())
+    return False
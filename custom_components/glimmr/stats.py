@@ -0,0 +1,104 @@
+"""Bounded aggregation of Glimmr device stats."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# Scalar stats pushed by the device, keyed by their payload name
+STAT_FIELDS: Mapping[str, str] = {
+    "cpuUsage": "cpu_usage",
+    "cpuTemp": "cpu_temp",
+    "memoryUsage": "memory_usage",
+}
+FPS_PREFIX = "fps_"
+
+
+@dataclass(frozen=True)
+class StatResult:
+    """Min, mean and max of one metric over a window."""
+
+    minimum: float
+    mean: float
+    maximum: float
+    samples: int
+
+
+class StatWindow:
+    """Constant-size running min/mean/max accumulator."""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize an empty window."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new window."""
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Accumulate a sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def result(self) -> StatResult:
+        """Return the window's aggregate."""
+        return StatResult(
+            minimum=self.minimum,
+            mean=round(self.total / self.count, 2),
+            maximum=self.maximum,
+            samples=self.count,
+        )
+
+
+class StatsAggregator:
+    """Fold a stats stream into one window per metric.
+
+    Memory stays constant no matter how fast stats arrive; ``flush`` closes
+    the current windows and publishes their results.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregator."""
+        self.values: dict[str, StatResult] = {}
+        self._windows: dict[str, StatWindow] = {}
+
+    @property
+    def metrics(self) -> list[str]:
+        """Return every metric seen so far."""
+        return list(self._windows)
+
+    def add(self, payload: Mapping[str, Any]) -> None:
+        """Accumulate one stats payload."""
+        for key, metric in STAT_FIELDS.items():
+            self._add(metric, payload.get(key))
+        fps = payload.get("fps")
+        if isinstance(fps, Mapping):
+            for source, value in fps.items():
+                self._add(f"{FPS_PREFIX}{source}", value)
+
+    def _add(self, metric: str, value: Any) -> None:
+        """Accumulate a numeric sample for a metric."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        if (window := self._windows.get(metric)) is None:
+            window = self._windows[metric] = StatWindow()
+        window.add(value)
+
+    def flush(self) -> bool:
+        """Publish and reset every window with samples, returning if any did."""
+        published = False
+        for metric, window in self._windows.items():
+            if window.count:
+                self.values[metric] = window.result()
+                window.reset()
+                published = True
+        return published
@@ -0,0 +1,121 @@
+"""Keep a Glimmr device socket open."""
+from __future__ import annotations
+
+import asyncio
+import random
+from time import monotonic
+from typing import Any
+
+from .const import LOGGER, RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY, RECONNECT_STABLE
+from .signalr import GlimmrSocket, GlimmrSocketError
+
+
+class SocketSupervisor:
+    """Reconnect a device socket with jittered exponential backoff.
+
+    Handlers stay registered on the socket across reconnects, so every
+    reopened connection dispatches to the same coordinator callbacks.
+    """
+
+    def __init__(self, socket: GlimmrSocket) -> None:
+        """Initialize the supervisor."""
+        self.socket = socket
+        self.reconnects = 0
+        self._task: asyncio.Task | None = None
+        self._closed = asyncio.Event()
+        self._connected_since: float | None = None
+        self._fallback_since: float | None = None
+        self._fallback_time = 0.0
+        socket.on_open(self._async_opened)
+        socket.on_close(self._async_closed)
+
+    @property
+    def uptime(self) -> float:
+        """Return seconds the current connection has been open."""
+        if self._connected_since is None:
+            return 0.0
+        return monotonic() - self._connected_since
+
+    @property
+    def fallback_time(self) -> float:
+        """Return total seconds spent polling without a socket."""
+        if self._fallback_since is None:
+            return self._fallback_time
+        return self._fallback_time + monotonic() - self._fallback_since
+
+    def async_start(self) -> None:
+        """Start supervising the socket."""
+        if self._task is None or self._task.done():
+            self._fallback_since = monotonic()
+            self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop reconnecting and close the socket."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.socket.disconnect()
+        if self._fallback_since is not None:
+            self._fallback_time += monotonic() - self._fallback_since
+            self._fallback_since = None
+
+    def _async_opened(self) -> None:
+        """Record the start of a connection."""
+        now = monotonic()
+        self._connected_since = now
+        if self._fallback_since is not None:
+            self._fallback_time += now - self._fallback_since
+            self._fallback_since = None
+
+    def _async_closed(self) -> None:
+        """Record the end of a connection and wake the supervisor."""
+        self._connected_since = None
+        if self._fallback_since is None:
+            self._fallback_since = monotonic()
+        self._closed.set()
+
+    async def _async_run(self) -> None:
+        """Connect, wait for the connection to drop, back off and repeat."""
+        attempt = 0
+        while True:
+            self._closed.clear()
+            try:
+                await self.socket.connect()
+            except GlimmrSocketError as err:
+                LOGGER.debug("%s, falling back to polling", err)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Unexpected error connecting to %s", self.socket.host)
+            else:
+                opened = monotonic()
+                await self._closed.wait()
+                self.reconnects += 1
+                if monotonic() - opened >= RECONNECT_STABLE:
+                    attempt = 0
+            delay = backoff_delay(attempt)
+            attempt += 1
+            LOGGER.debug("Reconnecting to %s in %.1fs", self.socket.host, delay)
+            await asyncio.sleep(delay)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return connection metrics."""
+        return {
+            "connected": self.socket.connected,
+            "protocol": self.socket.protocol,
+            "uptime": round(self.uptime, 1),
+            "reconnects": self.reconnects,
+            "fallback_time": round(self.fallback_time, 1),
+        }
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a jittered delay before reconnect ``attempt``.
+
+    Half of the exponential delay is fixed and half is random, so devices
+    that dropped together do not all reconnect at the same moment.
+    """
+    cap = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+    return cap / 2 + random.uniform(0, cap / 2)
@@ -0,0 +1,180 @@
+"""DreamScreen-style UDP transport for Glimmr."""
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+from .const import LOGGER, UDP_ACK_TIMEOUT, UDP_PORT
+
+PACKET_START = 0xFC
+# Flags addressing a single device rather than a group broadcast
+FLAGS_UNICAST = 0x21
+DEFAULT_GROUP = 0
+
+NAMESPACE_CONFIG = 0x03
+COMMAND_MODE = 0x01
+COMMAND_AMBIENT_COLOR = 0x05
+COMMAND_AMBIENT_MODE_TYPE = 0x08
+
+# Glimmr device modes the DreamScreen protocol can express
+UDP_MODES = frozenset({0, 1, 2, 3})
+
+
+def _crc8_table() -> tuple[int, ...]:
+    """Return the CRC-8 (poly 0x07) lookup table used by DreamScreen packets."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return tuple(table)
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data: bytes) -> int:
+    """Return the DreamScreen checksum of a packet."""
+    crc = 0
+    for byte in data:
+        crc = CRC8_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def build_packet(
+    command: int,
+    payload: bytes,
+    *,
+    namespace: int = NAMESPACE_CONFIG,
+    group: int = DEFAULT_GROUP,
+    flags: int = FLAGS_UNICAST,
+) -> bytes:
+    """Frame a command and its payload as a DreamScreen packet."""
+    packet = bytes(
+        (PACKET_START, len(payload) + 5, group, flags, namespace, command)
+    ) + payload
+    return packet + bytes((crc8(packet),))
+
+
+def parse_packet(data: bytes) -> tuple[int, int, bytes] | None:
+    """Return the namespace, command and payload of a valid packet, or None."""
+    if (
+        len(data) < 7
+        or data[0] != PACKET_START
+        or data[1] != len(data) - 2
+        or crc8(data[:-1]) != data[-1]
+    ):
+        return None
+    return data[4], data[5], data[6:-1]
+
+
+def mode_packet(mode: int) -> bytes | None:
+    """Return the packet setting a device mode, if UDP can express it."""
+    if mode not in UDP_MODES:
+        return None
+    return build_packet(COMMAND_MODE, bytes((mode,)))
+
+
+def color_packets(color: str) -> list[bytes]:
+    """Return the packets switching ambient mode to a solid ``#rrggbb`` color."""
+    return [
+        build_packet(COMMAND_AMBIENT_MODE_TYPE, b"\x00"),
+        build_packet(COMMAND_AMBIENT_COLOR, bytes.fromhex(color.lstrip("#"))),
+    ]
+
+
+class _AckProtocol(asyncio.DatagramProtocol):
+    """Pass datagrams from the device to the transport as possible acks."""
+
+    def __init__(self, transport: GlimmrUdpTransport) -> None:
+        self._owner = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._owner.async_acknowledge(data)
+
+    def error_received(self, exc: Exception) -> None:
+        LOGGER.debug("UDP error from %s: %s", self._owner.host, exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._owner.transport = None
+
+
+class GlimmrUdpTransport:
+    """Send state changes to a Glimmr device as UDP datagrams.
+
+    Datagrams are fire and forget, so a send only counts as delivered when
+    the device answers or ``confirmed`` resolves within the ack timeout.
+    """
+
+    def __init__(self, host: str, port: int = UDP_PORT) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.port = port
+        self.transport: asyncio.DatagramTransport | None = None
+        self.acked = 0
+        self.unacked = 0
+        self.latency: float | None = None
+        self._ack: asyncio.Future | None = None
+        self._expected: tuple[int, int] | None = None
+
+    async def _async_endpoint(self) -> asyncio.DatagramTransport:
+        """Return the datagram endpoint, opening it on first use."""
+        if self.transport is None:
+            self.transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _AckProtocol(self), remote_addr=(self.host, self.port)
+            )
+        return self.transport
+
+    def async_acknowledge(self, data: bytes) -> None:
+        """Resolve the pending acknowledgement if ``data`` answers the last packet sent.
+
+        Only a well-formed packet echoing the namespace and command of that
+        packet counts; anything else the device sends is ignored.
+        """
+        if self._ack is None or self._ack.done():
+            return
+        if (parsed := parse_packet(data)) is not None and parsed[:2] == self._expected:
+            self._ack.set_result(None)
+
+    async def async_send(
+        self,
+        packets: list[bytes],
+        confirmed: asyncio.Future | None = None,
+        timeout: float = UDP_ACK_TIMEOUT,
+    ) -> bool:
+        """Send packets and return whether the device acknowledged them in time."""
+        try:
+            transport = await self._async_endpoint()
+        except OSError as err:
+            LOGGER.debug("Cannot open UDP endpoint for %s: %s", self.host, err)
+            return False
+
+        loop = asyncio.get_running_loop()
+        self._ack = ack = loop.create_future()
+        self._expected = (packets[-1][4], packets[-1][5])
+        waiters = {ack} if confirmed is None else {ack, confirmed}
+        started = monotonic()
+        for packet in packets:
+            transport.sendto(packet)
+        done, _ = await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        self._ack = None
+        self._expected = None
+        if not done:
+            self.unacked += 1
+            return False
+        self.acked += 1
+        self.latency = monotonic() - started
+        return True
+
+    def close(self) -> None:
+        """Close the datagram endpoint."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def diagnostics(self) -> dict[str, float | int | None]:
+        """Return delivery counters."""
+        return {"acked": self.acked, "unacked": self.unacked, "latency": self.latency}
@@ -0,0 +1,89 @@
+"""Test the Glimmr circuit breaker."""
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.glimmr_light.breaker import (
+    MIN_SAMPLES,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from homeassistant.components.glimmr_light.const import TIMEOUT_MAX, TIMEOUT_MIN
+
+
+@pytest.fixture
+def clock():
+    """Patch the breaker's clock with one the test advances."""
+    now = [1000.0]
+    with patch(
+        "homeassistant.components.glimmr_light.breaker.monotonic",
+        side_effect=lambda: now[0],
+    ):
+        yield now
+
+
+def test_opens_after_consecutive_failures(clock):
+    """Test the breaker opens at the threshold and success resets the count."""
+    breaker = CircuitBreaker(threshold=3, backoff=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in == 10
+
+
+def test_probe_after_backoff_closes_on_success(clock):
+    """Test a single probe is let through once the backoff has passed."""
+    breaker = CircuitBreaker(threshold=1, backoff=10)
+    breaker.record_failure()
+    clock[0] += 10
+
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success(0.1)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.retry_in == 0
+
+
+def test_failed_probe_doubles_backoff(clock):
+    """Test a failed probe reopens the breaker for twice as long, up to the cap."""
+    breaker = CircuitBreaker(threshold=1, backoff=10, max_backoff=30)
+    breaker.record_failure()
+    for expected in (20, 30, 30):
+        clock[0] += breaker.retry_in
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert breaker.retry_in == expected
+
+
+def test_timeout_adapts_to_latency():
+    """Test the timeout is the clamped 95th percentile times three."""
+    breaker = CircuitBreaker()
+    for _ in range(MIN_SAMPLES - 1):
+        breaker.record_success(0.5)
+    assert breaker.timeout == TIMEOUT_MAX
+
+    breaker.record_success(0.5)
+    assert breaker.timeout == 1.5
+
+    fast = CircuitBreaker()
+    for _ in range(MIN_SAMPLES):
+        fast.record_success(0.01)
+    assert fast.timeout == TIMEOUT_MIN
+
+    slow = CircuitBreaker()
+    for _ in range(MIN_SAMPLES):
+        slow.record_success(10)
+    assert slow.timeout == TIMEOUT_MAX
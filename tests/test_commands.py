@@ -0,0 +1,130 @@
+"""Test the Glimmr command queue."""
+import asyncio
+
+import pytest
+
+from homeassistant.components.glimmr_light.commands import (
+    COMMAND_COLOR,
+    COMMAND_MODE,
+    COMMAND_REFRESH,
+    PRIORITY_BACKGROUND,
+    GlimmrCommandQueue,
+)
+
+
+def _gated(calls, name, gate, result=None):
+    """Return a call that records its name and waits for ``gate``."""
+
+    async def _call():
+        calls.append(name)
+        await gate.wait()
+        return result if result is not None else name
+
+    return _call
+
+
+async def _settle():
+    """Let submitted callers and started commands run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_waiting_command_is_superseded():
+    """Test only the newest waiting call of a kind runs, for every caller."""
+    queue = GlimmrCommandQueue()
+    gate = asyncio.Event()
+    calls = []
+
+    busy = asyncio.ensure_future(queue.async_submit(COMMAND_MODE, _gated(calls, "mode", gate)))
+    await _settle()
+    first = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _gated(calls, "red", gate)))
+    second = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _gated(calls, "blue", gate)))
+    await _settle()
+    assert queue.depth == 1
+
+    gate.set()
+    assert await asyncio.gather(busy, first, second) == ["mode", "blue", "blue"]
+    assert calls == ["mode", "blue"]
+    assert queue.dropped == 1
+    assert queue.executed == 2
+
+
+async def test_user_commands_run_before_background():
+    """Test a user command overtakes a background command queued earlier."""
+    queue = GlimmrCommandQueue()
+    gate = asyncio.Event()
+    calls = []
+
+    busy = asyncio.ensure_future(queue.async_submit(COMMAND_MODE, _gated(calls, "mode", gate)))
+    await _settle()
+    refresh = asyncio.ensure_future(
+        queue.async_submit(
+            COMMAND_REFRESH, _gated(calls, "refresh", gate), priority=PRIORITY_BACKGROUND
+        )
+    )
+    color = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _gated(calls, "color", gate)))
+    await _settle()
+
+    gate.set()
+    await asyncio.gather(busy, refresh, color)
+    assert calls == ["mode", "color", "refresh"]
+
+
+async def test_in_flight_limit():
+    """Test no more than max_in_flight commands run at once."""
+    queue = GlimmrCommandQueue(max_in_flight=2)
+    gate = asyncio.Event()
+    calls = []
+
+    submitted = [
+        asyncio.ensure_future(queue.async_submit(kind, _gated(calls, kind, gate)))
+        for kind in (COMMAND_COLOR, COMMAND_MODE, COMMAND_REFRESH)
+    ]
+    await _settle()
+    assert queue.in_flight == 2
+    assert queue.depth == 1
+    assert calls == [COMMAND_COLOR, COMMAND_MODE]
+
+    gate.set()
+    await asyncio.gather(*submitted)
+    assert queue.in_flight == 0
+    assert queue.executed == 3
+
+
+async def test_failure_reaches_every_caller():
+    """Test a failing call raises for all callers that were merged into it."""
+    queue = GlimmrCommandQueue()
+    gate = asyncio.Event()
+
+    async def _fail():
+        raise ValueError("boom")
+
+    busy = asyncio.ensure_future(queue.async_submit(COMMAND_MODE, _gated([], "mode", gate)))
+    await _settle()
+    first = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _gated([], "red", gate)))
+    second = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _fail))
+    await _settle()
+    gate.set()
+    await busy
+
+    for caller in (first, second):
+        with pytest.raises(ValueError):
+            await caller
+
+
+async def test_stop_cancels_running_and_waiting_commands():
+    """Test stopping the queue cancels its tasks and waiting callers."""
+    queue = GlimmrCommandQueue()
+    gate = asyncio.Event()
+
+    running = asyncio.ensure_future(queue.async_submit(COMMAND_MODE, _gated([], "mode", gate)))
+    await _settle()
+    waiting = asyncio.ensure_future(queue.async_submit(COMMAND_COLOR, _gated([], "red", gate)))
+    await _settle()
+
+    await queue.async_stop()
+    for caller in (running, waiting):
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+    assert queue.depth == 0
+    assert queue.in_flight == 0
@@ -1,5 +1,5 @@
 """Test the WiZ Light config flow."""
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -9,6 +9,7 @@ from homeassistant.components.glimmr_light.config_flow import (
     GlimmrError
 )
 from homeassistant.components.glimmr_light.const import DOMAIN
+from homeassistant.components.glimmr_light.scanner import DiscoveredGlimmr
 from homeassistant.const import CONF_HOST, CONF_NAME
 
 from tests.common import MockConfigEntry
@@ -77,13 +78,23 @@ TEST_CONNECTION = {CONF_HOST: "1.1.1.1", CONF_NAME: "Test Bulb"}
 TEST_NO_IP = {CONF_HOST: "this is no IP input", CONF_NAME: "Test Bulb"}
 
 
-async def test_form(hass):
-    """Test we get the form."""
-    await setup.async_setup_component(hass, "persistent_notification", {})
+async def _async_start_host_flow(hass):
+    """Start a user flow and choose to enter a host."""
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["type"] == "menu"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "host"}
+    )
+
+
+async def test_form(hass):
+    """Test we get the form."""
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    result = await _async_start_host_flow(hass)
     assert result["type"] == "form"
+    assert result["step_id"] == "host"
     assert result["errors"] == {}
     # Patch functions
     with patch(
@@ -123,9 +134,7 @@ async def test_form(hass):
 )
 async def test_user_form_exceptions(hass, side_effect, error_base):
     """Test all user exceptions in the flow."""
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await _async_start_host_flow(hass)
 
     with patch(
         "homeassistant.components.glimmr_light.glimmrlight.getBulbConfig",
@@ -154,9 +163,7 @@ async def test_form_updates_unique_id(hass):
 
     entry.add_to_hass(hass)
 
-    result = await hass.config_entries.flow.async_init(
-        DOMAIN, context={"source": config_entries.SOURCE_USER}
-    )
+    result = await _async_start_host_flow(hass)
     with patch(
         "homeassistant.components.glimmr_light.glimmrlight.getBulbConfig",
         return_value=FAKE_BULB_CONFIG,
@@ -174,3 +181,107 @@ async def test_form_updates_unique_id(hass):
 
     assert result2["type"] == "abort"
     assert result2["reason"] == "single_instance_allowed"
+
+
+TEST_ZEROCONF = {
+    "host": "2.2.2.2",
+    "hostname": "glimmr-abc.local.",
+    "properties": {"mac": TEST_SYSTEM_INFO["id"]},
+}
+
+
+async def test_zeroconf_known_mac_updates_host_without_probe(hass):
+    """Test a configured device's announcement aborts before any network I/O."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=TEST_SYSTEM_INFO["id"],
+        data={CONF_HOST: "1.1.1.1", "mac": TEST_SYSTEM_INFO["id"]},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "homeassistant.components.glimmr_light.config_flow.async_create_glimmr",
+    ) as mock_create:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_ZEROCONF},
+            data=dict(TEST_ZEROCONF),
+        )
+
+    assert result["type"] == "abort"
+    assert result["reason"] == "already_configured"
+    assert entry.data[CONF_HOST] == "2.2.2.2"
+    assert mock_create.call_count == 0
+
+
+async def test_zeroconf_repeated_announcement_is_debounced(hass):
+    """Test repeated announcements from one host are ignored."""
+    discovery = {**TEST_ZEROCONF, "properties": {}}
+    with patch(
+        "homeassistant.components.glimmr_light.config_flow.async_create_glimmr",
+    ) as mock_create:
+        mock_create.return_value.update = AsyncMock(side_effect=GlimmrConnectionError)
+        await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_ZEROCONF},
+            data=dict(discovery),
+        )
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_ZEROCONF},
+            data=dict(discovery),
+        )
+
+    assert result["type"] == "abort"
+    assert result["reason"] == "already_in_progress"
+    assert mock_create.call_count == 1
+
+
+async def test_user_subnet_scan_lists_found_devices(hass):
+    """Test entering a subnet scans it and offers the devices found."""
+    with patch(
+        "homeassistant.components.glimmr_light.config_flow.async_scan_network",
+        return_value=[DiscoveredGlimmr("1.1.1.5", TEST_SYSTEM_INFO["id"], "glimmr")],
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_USER},
+            data={CONF_HOST: "1.1.1.0/24"},
+        )
+
+    assert result["type"] == "form"
+    assert result["step_id"] == "pick"
+
+
+async def test_user_subnet_scan_rejects_large_network(hass):
+    """Test a subnet larger than the scan limit is rejected."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_USER},
+        data={CONF_HOST: "10.0.0.0/8"},
+    )
+
+    assert result["type"] == "form"
+    assert result["step_id"] == "scan"
+    assert result["errors"] == {"base": "invalid_network"}
+
+
+async def test_user_menu_offers_subnet_scan(hass):
+    """Test the user menu leads to a scan form prefilled with the local subnet."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == "menu"
+    assert result["menu_options"] == ["host", "scan"]
+
+    with patch(
+        "homeassistant.components.glimmr_light.config_flow.network.async_get_source_ip",
+        return_value="1.1.1.20",
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "scan"}
+        )
+
+    assert result["type"] == "form"
+    assert result["step_id"] == "scan"
+    assert result["data_schema"]({})["network"] == "1.1.1.0/24"
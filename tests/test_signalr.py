@@ -0,0 +1,164 @@
+"""Test the Glimmr SignalR client and message framing."""
+import asyncio
+import json
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+import msgpack
+import pytest
+
+from homeassistant.components.glimmr_light.signalr import (
+    MESSAGE_INVOCATION,
+    MESSAGE_PING,
+    RECORD_SEPARATOR,
+    GlimmrSocket,
+    _decode,
+    _decode_msgpack,
+    _frame_msgpack,
+    _read_varint,
+)
+
+
+def _hub_app():
+    """Return a hub that completes the handshake and then closes the socket."""
+
+    async def negotiate(request):
+        return web.json_response({"connectionToken": "token"})
+
+    async def socket(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive()
+        await ws.send_str("{}" + RECORD_SEPARATOR)
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_post("/socket/negotiate", negotiate)
+    app.router.add_get("/socket", socket)
+    return app
+
+
+def _invocation(target, *arguments):
+    """Return a MessagePack invocation of ``target``."""
+    return _frame_msgpack([MESSAGE_INVOCATION, {}, None, target, list(arguments)])
+
+
+async def test_close_handlers_run_when_device_closes(socket_enabled):
+    """Test a socket closed by the device reports the close."""
+    events = []
+    closed = asyncio.Event()
+    async with TestServer(_hub_app()) as server, ClientSession() as session:
+        socket = GlimmrSocket(f"{server.host}:{server.port}", session)
+        socket.on_open(lambda: events.append("open"))
+        socket.on_close(lambda: (events.append("close"), closed.set()))
+
+        await socket.connect()
+        await asyncio.wait_for(closed.wait(), 5)
+        await socket.disconnect()
+
+    assert events == ["open", "close"]
+    assert not socket.connected
+
+
+@pytest.mark.parametrize("length", [0, 1, 127, 128, 300, 16384, 2**21 + 5])
+def test_varint_round_trip(length):
+    """Test length prefixes decode to the length they were framed with."""
+    framed = _frame_msgpack(["x" * length])
+    body_length, pos = _read_varint(memoryview(framed), 0)
+    assert body_length == len(framed) - pos
+    assert msgpack.unpackb(framed[pos:], raw=False) == ["x" * length]
+
+
+def test_truncated_varint():
+    """Test a prefix that never ends is rejected."""
+    with pytest.raises(ValueError):
+        _read_varint(memoryview(b"\x80\x80"), 0)
+
+
+def test_decode_msgpack_frame():
+    """Test several records in one frame are split and decoded."""
+    frame = (
+        _invocation("mode", 3)
+        + _frame_msgpack([MESSAGE_PING])
+        + _invocation("frames", b"\x01\x02\x03")
+    )
+    assert _decode_msgpack(frame) == [
+        {"type": MESSAGE_INVOCATION, "target": "mode", "arguments": [3]},
+        {"type": MESSAGE_PING},
+        {"type": MESSAGE_INVOCATION, "target": "frames", "arguments": [b"\x01\x02\x03"]},
+    ]
+
+
+def test_decode_msgpack_skips_unwanted_targets():
+    """Test invocations nobody handles are dropped."""
+    frame = _invocation("log", "noise") + _invocation("mode", 1)
+    messages = _decode_msgpack(frame, lambda target: target == "mode")
+    assert [message["target"] for message in messages] == ["mode"]
+
+
+def test_decode_msgpack_camel_cases_read_keys():
+    """Test C# member names are normalised for the keys the handlers read."""
+    store = {
+        "SystemData": {"DeviceMode": 1, "DeviceName": "Glimmr"},
+        "AmbientScenes": [{"Id": 1, "Name": "Rainbow"}],
+        "Stats": {"CpuUsage": 5, "Fps": {"Dream": 60}},
+        "DevData": [{"Id": "strip"}],
+    }
+    (message,) = _decode_msgpack(_invocation("olo", store))
+    assert message["arguments"] == [
+        {
+            "systemData": {"deviceMode": 1, "deviceName": "Glimmr"},
+            "ambientScenes": [{"id": 1, "name": "Rainbow"}],
+            "stats": {"cpuUsage": 5, "fps": {"dream": 60}},
+            "devData": [{"Id": "strip"}],
+        }
+    ]
+
+
+def test_decode_msgpack_keeps_camel_case():
+    """Test payloads already in camelCase are passed through."""
+    store = {"systemData": {"deviceMode": 1}}
+    (message,) = _decode_msgpack(_invocation("olo", store))
+    assert message["arguments"] == [store]
+
+
+def test_decode_msgpack_skips_malformed_record():
+    """Test a bad record is skipped and the records after it still decode."""
+    bad = _frame_msgpack({"not": "an array"})
+    truncated = bytes([3]) + msgpack.packb([MESSAGE_INVOCATION, {}])[:3]
+    frame = _invocation("mode", 1) + bad + truncated + _invocation("mode", 2)
+    messages = _decode_msgpack(frame)
+    assert [message["arguments"] for message in messages] == [[1], [2]]
+
+
+def test_decode_msgpack_stops_at_bad_length():
+    """Test records before an unreadable length prefix are kept."""
+    frame = _invocation("mode", 1) + b"\xff"
+    assert len(_decode_msgpack(frame)) == 1
+
+
+def test_decode_json_records():
+    """Test text frames are split on the record separator."""
+    records = [
+        {"type": MESSAGE_INVOCATION, "target": "mode", "arguments": [2]},
+        {"type": MESSAGE_PING},
+    ]
+    data = "".join(json.dumps(record) + RECORD_SEPARATOR for record in records)
+    assert _decode(data) == records
+
+
+def test_decode_json_skips_malformed_record():
+    """Test a record that is not JSON does not drop the others."""
+    data = (
+        '{"type": 1, "target": "mode", "arguments": [1]}'
+        + RECORD_SEPARATOR
+        + '{"type": 1, "target": "mo'
+        + RECORD_SEPARATOR
+        + '{"type": 6}'
+        + RECORD_SEPARATOR
+    )
+    assert _decode(data) == [
+        {"type": 1, "target": "mode", "arguments": [1]},
+        {"type": 6},
+    ]
@@ -0,0 +1,104 @@
+"""Test the Glimmr socket supervisor."""
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.components.glimmr_light.const import (
+    RECONNECT_MAX_DELAY,
+    RECONNECT_MIN_DELAY,
+    SCAN_INTERVAL,
+)
+from homeassistant.components.glimmr_light.coordinator import (
+    GlimmrDataUpdateCoordinator,
+)
+from homeassistant.components.glimmr_light.signalr import GlimmrSocketError
+from homeassistant.components.glimmr_light.supervisor import backoff_delay
+
+
+class FakeSocket:
+    """Socket to a device that can be taken offline."""
+
+    def __init__(self, host, session, protocol=None):
+        """Initialize the socket."""
+        self.host = host
+        self.protocol = protocol
+        self.connected = False
+        self.online = True
+        self._open_handlers = []
+        self._close_handlers = []
+
+    def on(self, target, handler):
+        """Accept hub handlers; nothing is pushed."""
+        return lambda: None
+
+    def on_open(self, handler):
+        """Register an open handler."""
+        self._open_handlers.append(handler)
+        return lambda: self._open_handlers.remove(handler)
+
+    def on_close(self, handler):
+        """Register a close handler."""
+        self._close_handlers.append(handler)
+        return lambda: self._close_handlers.remove(handler)
+
+    async def connect(self):
+        """Open the connection if the device is online."""
+        if not self.online:
+            raise GlimmrSocketError(f"{self.host} is offline")
+        self.connected = True
+        for handler in list(self._open_handlers):
+            handler()
+
+    async def disconnect(self):
+        """Close the connection."""
+        if self.connected:
+            self.connected = False
+            for handler in list(self._close_handlers):
+                handler()
+
+
+async def _settle():
+    """Let the supervisor run until it blocks."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_reconnect_after_device_drops(hass):
+    """Test a dropped socket polls until it reopens, then resyncs once."""
+    with patch(
+        "homeassistant.components.glimmr_light.coordinator.GlimmrSocket", FakeSocket
+    ), patch(
+        "homeassistant.components.glimmr_light.supervisor.backoff_delay",
+        return_value=0,
+    ):
+        coordinator = GlimmrDataUpdateCoordinator(hass, host="1.2.3.4")
+        socket = coordinator.socket
+        with patch.object(coordinator, "async_request_refresh") as refresh:
+            coordinator.supervisor.async_start()
+            await _settle()
+            assert socket.connected
+            assert coordinator.update_interval is None
+            refresh.assert_not_called()
+
+            # The device reboots: polling resumes while it cannot be reached.
+            socket.online = False
+            await socket.disconnect()
+            await _settle()
+            assert not socket.connected
+            assert coordinator.update_interval == SCAN_INTERVAL
+            assert refresh.call_count == 1
+
+            socket.online = True
+            await _settle()
+            assert socket.connected
+            assert coordinator.supervisor.reconnects == 1
+            assert coordinator.update_interval is None
+            assert refresh.call_count == 2
+
+        await coordinator.async_stop()
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    """Test delays stay within half and all of the capped exponential delay."""
+    for attempt in range(12):
+        cap = min(RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY * 2**attempt)
+        assert cap / 2 <= backoff_delay(attempt) <= cap